@@ -6,12 +6,15 @@ Separated to avoid circular imports
 import time
 import logging
 import sys
+import threading
+import copy
 import traceback
 from typing import Dict, Optional, List
 import json
 import requests
 import hashlib
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import os
 import re
 import pytz
@@ -660,7 +663,10 @@ class AzureAuthenticator:
 # Enhanced Azure AI Agent Client
 class EnhancedAzureAIAgentClient:
     """Enhanced wrapper for Azure AI Agent operations with document management"""
-    
+
+    # Maximum sub-requests accepted by a single Blob Batch call
+    BLOB_BATCH_LIMIT = 256
+
     def __init__(self, connection_string: str, agent_id: str, config: AzureConfig, container_name: str = None):
         """
         Initialize Enhanced Azure AI Agent Client with document reference support
@@ -1917,19 +1923,89 @@ class EnhancedAzureAIAgentClient:
             
             
             # Use standard deletion method for the specified index
-            index_deletion_success = self._standard_index_deletion(container_name, file_name, index_name)
-            
-            if index_deletion_success:
-                pass
-            else:
-                # Still return True since blob deletion succeeded, but log the issue
-                pass
-            
-            return True
+            # Same rule as delete_documents_batch: a document left in the index is a failure
+            return self._standard_index_deletion(container_name, file_name, index_name)
             
         except Exception as e:
             return False
 
+    def delete_documents_batch(self, container_name: str, file_names: List[str], index_name: str = None) -> Dict:
+        """Delete several documents with Blob Batch requests and trigger a single reindex"""
+        file_names = list(file_names or [])
+        try:
+            # Strict validation: index_name is required (same rule as delete_document)
+            if not index_name or not isinstance(index_name, str) or index_name.strip() == "":
+                return {
+                    'success': False,
+                    'deleted': [],
+                    'failed': file_names,
+                    'index_failed': [],
+                    'message': "Search index is required for document deletion"
+                }
+
+            index_name = index_name.strip()
+            container_client = self.blob_client.get_container_client(container_name)
+
+            deleted = []
+            failed = []
+            index_failed = []
+
+            # One Blob Batch request per BLOB_BATCH_LIMIT files instead of one request per file
+            for start in range(0, len(file_names), self.BLOB_BATCH_LIMIT):
+                chunk = file_names[start:start + self.BLOB_BATCH_LIMIT]
+                responses = container_client.delete_blobs(*chunk, raise_on_any_failure=False)
+                for file_name, response in zip(chunk, responses):
+                    if 200 <= response.status_code < 300:
+                        deleted.append(file_name)
+                    else:
+                        failed.append(file_name)
+
+            if deleted:
+                # Remove index entries per file, but run the indexer only once for the whole batch
+                not_removed = []
+                for file_name in deleted:
+                    try:
+                        if not self.remove_document_from_index(container_name, file_name, index_name):
+                            not_removed.append(file_name)
+                    except Exception:
+                        not_removed.append(file_name)
+
+                try:
+                    reindex_result = self.trigger_reindex_after_document_change(container_name, index_name)
+                    reindexed = reindex_result["success"]
+                except Exception:
+                    reindexed = False
+
+                # Same rule as _standard_index_deletion: a file counts as removed from the index
+                # if the direct removal, the reindex or the search-and-delete fallback worked
+                if not reindexed:
+                    for file_name in not_removed:
+                        try:
+                            if not self._advanced_search_and_delete(container_name, file_name, index_name):
+                                index_failed.append(file_name)
+                        except Exception:
+                            index_failed.append(file_name)
+
+            message = f"Deleted {len(deleted)}/{len(file_names)} documents"
+            if index_failed:
+                message += f"; {len(index_failed)} may still appear in search"
+            return {
+                'success': not failed and not index_failed,
+                'deleted': deleted,
+                'failed': failed,
+                'index_failed': index_failed,  # Blob deleted, but the search index entry may remain
+                'message': message
+            }
+
+        except Exception as e:
+            return {
+                'success': False,
+                'deleted': [],
+                'failed': file_names,
+                'index_failed': [],
+                'message': f"Batch delete failed: {str(e)}"
+            }
+
     def _standard_index_deletion(self, container_name: str, file_name: str, index_name: str):
         """Standard index deletion process for all indexes"""
         deletion_success = False
@@ -4174,14 +4250,28 @@ class UserManager:
 class JobManager:
     """Manages background jobs for Data Analyzer agents"""
     
+    # Parallel blob downloads when loading job configurations
+    FETCH_WORKERS = 10
+    # Repeated job listings within this window reuse the previous fetch
+    JOBS_DEBOUNCE_SECONDS = 2.0
+    
     def __init__(self, config: AzureConfig):
         self.config = config
         self.container_name = "job-configs"
         self.logs_container = "job-logs"
         self.blob_client = None
         self.running_jobs = {}  # Track currently running jobs
+        self._jobs_cache: Optional[List[Dict]] = None
+        self._jobs_cache_timestamp: float = 0.0
+        # Shared by the Streamlit threads and the JobScheduler thread
+        self._jobs_cache_lock = threading.Lock()
         self._init_blob_client()
     
+    def _invalidate_jobs_cache(self):
+        with self._jobs_cache_lock:
+            self._jobs_cache = None
+            self._jobs_cache_timestamp = 0.0
+    
     def _init_blob_client(self):
         """Initialize blob client with proper authentication"""
         try:
@@ -4242,6 +4332,8 @@ class JobManager:
                 overwrite=True
             )
             
+            self._invalidate_jobs_cache()
+            
             # Send notification to admin users
             self._send_job_notification(job_id, 'created', 'Job successfully created')
             
@@ -4274,23 +4366,36 @@ class JobManager:
             logger.error(f"Error getting job {job_id}: {e}")
             return None
     
+    def _fetch_jobs(self) -> List[Dict]:
+        """Job configurations, re-downloaded at most once per debounce window"""
+        # The lock also makes concurrent callers wait for one download instead of each starting one
+        with self._jobs_cache_lock:
+            now = time.monotonic()
+            if self._jobs_cache is None or (now - self._jobs_cache_timestamp) > self.JOBS_DEBOUNCE_SECONDS:
+                self._jobs_cache = self._download_jobs()
+                self._jobs_cache_timestamp = now
+            # Callers update job dicts in place (status, last_run), so never hand out the cached ones
+            return copy.deepcopy(self._jobs_cache)
+    
+    def _download_jobs(self) -> List[Dict]:
+        """Download every job configuration, fetching the blobs in parallel"""
+        container_client = self.blob_client.get_container_client(self.container_name)
+        job_ids = [blob.name.replace('.json', '') for blob in container_client.list_blobs()
+                   if blob.name.endswith('.json')]
+        if not job_ids:
+            return []
+        
+        # get_job returns None on a failed download, so one bad blob never breaks the listing
+        with ThreadPoolExecutor(max_workers=min(self.FETCH_WORKERS, len(job_ids))) as executor:
+            return [job_data for job_data in executor.map(self.get_job, job_ids) if job_data]
+    
     def get_jobs_for_agent(self, agent_id: str) -> List[Dict]:
         """Get all jobs for a specific agent"""
         try:
             if not self.blob_client:
                 return []
-                
-            container_client = self.blob_client.get_container_client(self.container_name)
-            jobs = []
             
-            for blob in container_client.list_blobs():
-                if blob.name.endswith('.json'):
-                    job_id = blob.name.replace('.json', '')
-                    job_data = self.get_job(job_id)
-                    if job_data and job_data.get('agent_id') == agent_id:
-                        jobs.append(job_data)
-            
-            return jobs
+            return [job_data for job_data in self._fetch_jobs() if job_data.get('agent_id') == agent_id]
             
         except Exception as e:
             logger.error(f"Error getting jobs for agent {agent_id}: {e}")
@@ -4301,18 +4406,8 @@ class JobManager:
         try:
             if not self.blob_client:
                 return []
-                
-            container_client = self.blob_client.get_container_client(self.container_name)
-            jobs = []
-            
-            for blob in container_client.list_blobs():
-                if blob.name.endswith('.json'):
-                    job_id = blob.name.replace('.json', '')
-                    job_data = self.get_job(job_id)
-                    if job_data:
-                        jobs.append(job_data)
             
-            return jobs
+            return self._fetch_jobs()
             
         except Exception as e:
             logger.error(f"Error getting all jobs: {e}")
@@ -4343,6 +4438,7 @@ class JobManager:
                 overwrite=True
             )
             
+            self._invalidate_jobs_cache()
             logger.info(f"Job updated: {job_id}")
             return True
             
@@ -4367,6 +4463,7 @@ class JobManager:
             )
             
             blob_client.delete_blob()
+            self._invalidate_jobs_cache()
             
             # Send notification
             self._send_job_notification(job_id, 'deleted', 'Job deleted')
@@ -4781,13 +4878,14 @@ class JobScheduler:
             all_jobs = self.job_manager.get_all_jobs()
             
             for job in all_jobs:
-                if (job.get('schedule_type') == 'scheduled' and 
-                    job.get('status') != 'running' and
-                    job.get('schedule_hour') == current_hour and
-                    job.get('schedule_minute') == current_minute):
+                get = job.get  # Bound once; every field below is read a single time
+                if (get('schedule_type') == 'scheduled' and 
+                    get('status') != 'running' and
+                    get('schedule_hour') == current_hour and
+                    get('schedule_minute') == current_minute):
                     
                     # Check schedule period
-                    schedule_period = job.get('schedule_period', 'daily')
+                    schedule_period = get('schedule_period', 'daily')
                     should_execute = False
                     
                     if schedule_period == 'daily':
@@ -4796,13 +4894,13 @@ class JobScheduler:
                     
                     elif schedule_period == 'weekly':
                         # Check if it's the right day of week and not run this week
-                        job_weekday = job.get('schedule_weekday', 'Monday')
+                        job_weekday = get('schedule_weekday', 'Monday')
                         should_execute = (current_weekday == job_weekday and 
                                         not self._was_run_this_week(job, current_time))
                     
                     elif schedule_period == 'monthly':
                         # Check if it's the right day of month and not run this month
-                        job_day = job.get('schedule_day', 1)
+                        job_day = get('schedule_day', 1)
                         should_execute = (current_day == job_day and 
                                         not self._was_run_this_month(job, current_time))
                     
@@ -4811,8 +4909,9 @@ class JobScheduler:
                         should_execute = not self._was_run_today(job, current_time)
                     
                     if should_execute:
-                        logger.info(f"Executing scheduled job: {job['id']} ({schedule_period})")
-                        self.job_manager.execute_job(job['id'])
+                        job_id = job['id']
+                        logger.info(f"Executing scheduled job: {job_id} ({schedule_period})")
+                        self.job_manager.execute_job(job_id)
                     
         except Exception as e:
             logger.error(f"Error checking scheduled jobs: {e}")
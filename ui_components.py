@@ -12,13 +12,63 @@ import msal
 import time
 import logging
 import hashlib
+import re
 from datetime import datetime
 from typing import Dict, List
 from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Import Azure utilities once at module load
+try:
+    from azure_utils import EnhancedAzureAIAgentClient, AzureConfig, BlobStorageAgentManager
+except ImportError as e:
+    logger.warning(f"Azure utilities not available: {e}")
+    EnhancedAzureAIAgentClient = AzureConfig = BlobStorageAgentManager = None
+
+try:
+    from webjob_generator import create_webjob_package
+except ImportError as e:
+    logger.warning(f"WebJob generator not available: {e}")
+    create_webjob_package = None
+
+# orjson is optional; the configuration export falls back to compact stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Per-agent permission types, in the order they appear in the permission matrix
+_PERMISSION_TYPES = ("access", "chat", "document_upload", "document_download", "document_delete")
+_PERMISSION_COLUMNS = ("Access", "Chat", "Upload", "Download", "Delete")
+
+# First 6-digit hex color in a color or gradient string
+_HEX6_RE = re.compile(r'#[0-9a-fA-F]{6}')
+
+# Agent status presentation; any status other than "active" is shown as inactive
+_AGENT_STATUS_ICONS = {"active": "🟢", "inactive": "🔴"}
+_TOGGLE_ICONS = {"active": "⏸️", "inactive": "▶️"}
+
+# Colored status dot used in the agent detail rows
+_STATUS_DOT_CSS = """<style>
+.status-dot{display:inline-block;width:8px;height:8px;border-radius:50%;margin-right:4px}
+.status-dot-active{background:#0a0}
+.status-dot-inactive{background:#c00}
+</style>"""
+
+# Rows per page in the system settings users table
+_USERS_PAGE_SIZE = 500
+
+# WebJob schedule presets (Azure WebJobs NCRONTAB: second minute hour day month weekday)
+_WEBJOB_CRON_PRESETS = {
+    "Every hour": "0 0 * * * *",
+    "Every day at 9 AM": "0 0 9 * * *",
+    "Every Monday at 9 AM": "0 0 9 * * 1",
+    "First day of month at 9 AM": "0 0 9 1 * *"
+}
+
 def generate_response_hash(content: str, agent_id: str, user_input: str) -> str:
     """Generate a unique hash for a response to prevent duplicates"""
     # Only include content and user_input for exact duplicate detection
@@ -795,9 +845,8 @@ def show_dashboard():
                     agents = {}
         
         if not agents:
-            from azure_utils import AzureConfig, BlobStorageAgentManager
             # Initialize without any extra parameters
-            blob_agent_manager = BlobStorageAgentManager(AzureConfig())
+            blob_agent_manager = BlobStorageAgentManager(_get_azure_config())
             blob_agents = blob_agent_manager.get_active_agents()  # Only show active agents
             
             if blob_agents:
@@ -808,7 +857,6 @@ def show_dashboard():
         if not agents:
             backup_path = "config_backup/agent_configs.json"
             if os.path.exists(backup_path):
-                import json
                 with open(backup_path, 'r', encoding='utf-8') as f:
                     all_agents = json.load(f)
                 # Filter only enabled agents and ensure all required fields
@@ -848,7 +896,6 @@ def show_dashboard():
             backup_path = "config_backup/agent_configs.json"
             if os.path.exists(backup_path):
                 try:
-                    import json
                     with open(backup_path, 'r', encoding='utf-8') as f:
                         all_agents = json.load(f)
                     # Filter only enabled agents and ensure all required fields
@@ -1039,9 +1086,7 @@ def show_agent_chat(agent_config: Dict):
     if azure_agent_id not in st.session_state.ai_clients:
         try:
             with st.spinner("🔄 Connecting to Azure AI Foundry agent..."):
-                from azure_utils import EnhancedAzureAIAgentClient, AzureConfig
-                
-                config = AzureConfig()
+                config = _get_azure_config()
                 
                 # Get connection details from agent config
                 connection_string = agent_config.get('connection_string', '')
@@ -1631,27 +1676,41 @@ print("Mevcut dosyalar:", os.listdir('.'))"""
         return {"role": "assistant", "content": clean_message_content(error_msg)}
 
 
+# Per-container listing generation; bumping it makes only that container's cached listing miss
+_docs_generation: Dict[str, int] = {}
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _list_documents(_client, container_name: str, generation: int = 0) -> List[Dict]:
+    """Container listing, cached briefly so reruns don't re-list blob storage"""
+    return _client.list_documents(container_name)
+
+def _invalidate_documents(container_name: str) -> None:
+    """Drop the cached listing of one container after an upload or delete; other containers stay cached"""
+    _docs_generation[container_name] = _docs_generation.get(container_name, 0) + 1
+
 def show_document_management(agent_config: Dict):
     """Display document management interface"""
     
     agent_id = agent_config['id']
     
+    # Read the session values used for permission checks once
+    user_role = st.session_state.user_role
+    user_manager = st.session_state.user_manager
+    current_user = st.session_state.current_user
+    
     # Check permissions first
-    if st.session_state.user_role == "admin":
+    if user_role == "admin":
         can_upload = True
         can_delete = True
         can_download = True
-    elif not st.session_state.user_manager or not st.session_state.current_user:
+    elif not user_manager or not current_user:
         can_upload = False
         can_delete = False
         can_download = False
     else:
-        can_upload = st.session_state.user_manager.has_permission(
-            st.session_state.current_user, agent_id, "document_upload")
-        can_delete = st.session_state.user_manager.has_permission(
-            st.session_state.current_user, agent_id, "document_delete")
-        can_download = st.session_state.user_manager.has_permission(
-            st.session_state.current_user, agent_id, "document_download")
+        can_upload = user_manager.has_permission(current_user, agent_id, "document_upload")
+        can_delete = user_manager.has_permission(current_user, agent_id, "document_delete")
+        can_download = user_manager.has_permission(current_user, agent_id, "document_download")
     
     # Show permission status
     if not can_upload and not can_delete and not can_download:
@@ -1675,8 +1734,7 @@ def show_document_management(agent_config: Dict):
                 try:
                     # Initialize client if needed
                     if agent_id not in st.session_state.ai_clients:
-                        from azure_utils import EnhancedAzureAIAgentClient, AzureConfig
-                        config = AzureConfig()
+                        config = _get_azure_config()
                         client = EnhancedAzureAIAgentClient(
                             agent_config['connection_string'],
                             agent_config['agent_id'],
@@ -1732,47 +1790,51 @@ def show_document_management(agent_config: Dict):
                             st.info("🔍 Indexing has been triggered for search functionality")
                         if success_details:
                             with st.expander("📋 Upload Details"):
-                                for detail in success_details:
-                                    st.write(detail)
+                                # One element for all lines instead of one st.write per file
+                                st.markdown("  \n".join(success_details))
                     else:
                         st.error(f"❌ Only {success_count}/{len(uploaded_files)} files uploaded successfully")
                         if error_details:
                             with st.expander("📋 Error Details"):
-                                for detail in error_details:
-                                    st.write(detail)
+                                st.markdown("  \n".join(error_details))
                     
+                    # New blobs: drop the cached listing so it is fetched again
+                    _invalidate_documents(container_name)
                     st.rerun()
                     
                 except Exception as e:
                     st.error(f"❌ Upload operation failed: {str(e)}")
                     st.info("💡 If you're seeing a 400 error, this might be due to:")
-                    st.write("• File size too large (limit: 200MB per file)")
-                    st.write("• Unsupported file format")
-                    st.write("• Azure service configuration issues")
-                    st.write("• Network connectivity problems")
+                    st.markdown(
+                        "• File size too large (limit: 200MB per file)  \n"
+                        "• Unsupported file format  \n"
+                        "• Azure service configuration issues  \n"
+                        "• Network connectivity problems"
+                    )
                     
                     with st.expander("🔧 Troubleshooting"):
-                        st.write("1. Check if the file is a supported format (PDF, DOC, DOCX, TXT, XLS, XLSX, PPT, PPTX)")
-                        st.write("2. Ensure file size is under 200MB")
-                        st.write("3. Try uploading one file at a time")
-                        st.write("4. Contact administrator if the problem persists")
+                        st.markdown(
+                            "1. Check if the file is a supported format (PDF, DOC, DOCX, TXT, XLS, XLSX, PPT, PPTX)\n"
+                            "2. Ensure file size is under 200MB\n"
+                            "3. Try uploading one file at a time\n"
+                            "4. Contact administrator if the problem persists"
+                        )
     else:
         st.info("ℹ️ Document upload permission not available for this agent")
     
     st.markdown("---")
     
     # Document list section - check permission to view documents
-    if st.session_state.user_role == "admin":
+    if user_role == "admin":
         can_view_docs = True
     elif can_upload or can_delete or can_download:
         # If user can upload/delete/download, they can view
         can_view_docs = True
-    elif not st.session_state.user_manager or not st.session_state.current_user:
+    elif not user_manager or not current_user:
         can_view_docs = False
     else:
         # Basic access allows viewing
-        can_view_docs = st.session_state.user_manager.has_permission(
-            st.session_state.current_user, agent_id, "access")
+        can_view_docs = user_manager.has_permission(current_user, agent_id, "access")
     
     if not can_view_docs:
         st.warning("⚠️ You don't have permission to view documents for this agent")
@@ -1783,8 +1845,7 @@ def show_document_management(agent_config: Dict):
     try:
         # Initialize client if needed
         if agent_id not in st.session_state.ai_clients:
-            from azure_utils import EnhancedAzureAIAgentClient, AzureConfig
-            config = AzureConfig()
+            config = _get_azure_config()
             client = EnhancedAzureAIAgentClient(
                 agent_config['connection_string'],
                 agent_config['agent_id'],
@@ -1795,8 +1856,21 @@ def show_document_management(agent_config: Dict):
         
         client = st.session_state.ai_clients[agent_id]
         container_name = agent_config['container_name']
-        
-        documents = client.list_documents(container_name)
+    
+    except Exception as e:
+        st.error(f"❌ Error loading documents: {str(e)}")
+        return
+    
+    _render_docs(agent_config, client, container_name, can_delete, can_download)
+
+@st.fragment
+def _render_docs(agent_config: Dict, client, container_name: str, can_delete: bool, can_download: bool):
+    """Render the document library; delete actions rerun only this fragment"""
+    agent_id = agent_config['id']
+    
+    try:
+        # Cached for _list_documents' TTL, so blobs changed elsewhere show up within 30 s
+        documents = _list_documents(client, container_name, _docs_generation.get(container_name, 0))
         
         if documents:
             # Add document search and bulk operations with right-aligned delete button
@@ -1821,7 +1895,7 @@ def show_document_management(agent_config: Dict):
                                key=f"delete_all_{agent_id}", 
                                type="secondary"):
                         st.session_state[f"confirm_delete_all_{agent_id}"] = True
-                        st.rerun()
+                        st.rerun(scope="fragment")
             
             # Confirmation dialog (outside columns)
             if can_delete and st.session_state.get(f"confirm_delete_all_{agent_id}", False):
@@ -1835,23 +1909,25 @@ def show_document_management(agent_config: Dict):
                             if not index_name:
                                 st.error("❌ Bu ajan için search index yapılandırılmamış.")
                             else:
-                                deleted_count = 0
-                                failed_count = 0
-                                
-                                # Delete each document
-                                for doc in documents:
-                                    if client.delete_document(container_name, doc['name'], index_name):
-                                        deleted_count += 1
-                                    else:
-                                        failed_count += 1
+                                # Delete all documents with Blob Batch requests and a single reindex
+                                batch_result = client.delete_documents_batch(
+                                    container_name, [doc['name'] for doc in documents], index_name)
+                                deleted_count = len(batch_result['deleted'])
+                                failed_count = len(batch_result['failed'])
+                                st.session_state.get("pending_deletes", {}).pop(agent_id, None)
+                                _invalidate_documents(container_name)
                                 
                                 if deleted_count > 0:
                                     st.success(f"✅ {deleted_count} doküman başarıyla silindi!")
                                 if failed_count > 0:
                                     st.error(f"❌ {failed_count} doküman silinemedi.")
+                                if batch_result['index_failed']:
+                                    st.warning(f"⚠️ {len(batch_result['index_failed'])} doküman silindi ancak arama indeksinden kaldırılamadı: {', '.join(batch_result['index_failed'])}")
                                 
                                 st.session_state[f"confirm_delete_all_{agent_id}"] = False
-                                st.rerun()
+                                # Keep errors and warnings on screen instead of rerunning them away
+                                if batch_result['success']:
+                                    st.rerun(scope="fragment")
                         except Exception as e:
                             st.error(f"❌ Toplu silme hatası: {str(e)}")
                             st.session_state[f"confirm_delete_all_{agent_id}"] = False
@@ -1859,7 +1935,7 @@ def show_document_management(agent_config: Dict):
                 with col_no:
                     if st.button("❌ Hayır, İptal Et", key=f"confirm_no_{agent_id}"):
                         st.session_state[f"confirm_delete_all_{agent_id}"] = False
-                        st.rerun()
+                        st.rerun(scope="fragment")
             
             # Remove predefined sample/demo documents
             SAMPLE_DOC_NAMES = {"sample_report.pdf", "data_analysis.xlsx", "meeting_notes.docx"}
@@ -1878,55 +1954,97 @@ def show_document_management(agent_config: Dict):
             for doc in filtered_documents:
                 doc['size_mb'] = (doc['size'] / 1024 / 1024) if doc['size'] else 0
             
-            # Display filtered documents
+            # Documents selected for batch deletion, kept across reruns
+            pending_deletes = st.session_state.setdefault("pending_deletes", {}).setdefault(agent_id, set())
+            
+            # Display filtered documents as a single table; selected rows drive the action toolbar
             if filtered_documents:
-                for idx, doc in enumerate(filtered_documents):
-                    with st.expander(f"📄 {doc['name']} ({doc['size_mb']:.2f} MB)"):
-                        col1, col2, col3 = st.columns([2, 1, 1])
-                        with col1:
-                            st.write(f"**Size:** {doc['size_mb']:.2f} MB")
-                            st.write(f"**Modified:** {doc['last_modified']}")
-                            st.write(f"**Type:** {doc['content_type']}")
-                        
-                        with col2:
-                            if can_download:
-                                if st.button("📥 Download", key=f"download_{agent_id}_{idx}"):
-                                    try:
-                                        # Download document from blob storage
-                                        download_result = client.download_document(container_name, doc['name'])
-                                        if download_result['success']:
-                                            # Provide download button
-                                            st.download_button(
-                                                label=f"💾 Save {doc['name']}",
-                                                data=download_result['content'],
-                                                file_name=doc['name'],
-                                                mime=doc.get('content_type', 'application/octet-stream'),
-                                                key=f"save_{agent_id}_{idx}"
-                                            )
-                                            st.success(f"✅ {doc['name']} ready for download!")
-                                        else:
-                                            st.error(f"❌ Failed to download {doc['name']}: {download_result.get('message', 'Unknown error')}")
-                                    except Exception as e:
-                                        st.error(f"❌ Download error: {str(e)}")
-                            else:
-                                st.write("🔒 No download permission")
-                        
-                        with col3:
-                            if can_delete:
-                                if st.button("🗑️ Delete", key=f"delete_{agent_id}_{idx}", type="secondary"):
-                                    # Get index name from agent config - strict mode, no fallback
-                                    index_name = agent_config.get('search_index')
-                                    if not index_name:
-                                        st.error(f"❌ No search index configured for agent '{agent_id}'. Please configure 'search_index' in agent settings.")
-                                    else:
-                                        if client.delete_document(container_name, doc['name'], index_name):
-                                            st.success(f"✅ Deleted {doc['name']}")
-                                            st.info("🔄 Reindexing triggered automatically")
-                                            st.rerun()
-                                        else:
-                                            st.error(f"❌ Failed to delete {doc['name']} from index '{index_name}'")
+                docs_table = pd.DataFrame({
+                    'Name': [doc['name'] for doc in filtered_documents],
+                    'Size (MB)': [round(doc['size_mb'], 2) for doc in filtered_documents],
+                    'Modified': [doc['last_modified'] for doc in filtered_documents],
+                    'Type': [doc['content_type'] for doc in filtered_documents]
+                })
+                selection = st.dataframe(
+                    docs_table,
+                    hide_index=True,
+                    use_container_width=True,
+                    on_select="rerun",
+                    selection_mode="multi-row",
+                    key=f"docs_table_{agent_id}"
+                )
+                selected_docs = [filtered_documents[row] for row in selection.selection.rows
+                                 if row < len(filtered_documents)]
+                
+                # Selected rows are the pending batch deletion
+                pending_deletes.clear()
+                pending_deletes.update(doc['name'] for doc in selected_docs)
+                
+                if not selected_docs:
+                    st.caption("☑️ İşlem yapmak için tablodan doküman seçin")
+                else:
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        if not can_download:
+                            st.write("🔒 No download permission")
+                        elif len(selected_docs) > 1:
+                            st.caption("📥 İndirmek için tek bir doküman seçin")
+                        elif st.button("📥 Download", key=f"download_{agent_id}"):
+                            doc = selected_docs[0]
+                            try:
+                                # Download document from blob storage
+                                download_result = client.download_document(container_name, doc['name'])
+                                if download_result['success']:
+                                    # Provide download button
+                                    st.download_button(
+                                        label=f"💾 Save {doc['name']}",
+                                        data=download_result['content'],
+                                        file_name=doc['name'],
+                                        mime=doc.get('content_type', 'application/octet-stream'),
+                                        key=f"save_{agent_id}"
+                                    )
+                                    st.success(f"✅ {doc['name']} ready for download!")
+                                else:
+                                    st.error(f"❌ Failed to download {doc['name']}: {download_result.get('message', 'Unknown error')}")
+                            except Exception as e:
+                                st.error(f"❌ Download error: {str(e)}")
+                    
+                    with col2:
+                        if not can_delete:
+                            st.write("🔒 No delete permission")
+                        elif st.button(f"🗑️ Seçilenleri Sil ({len(pending_deletes)})",
+                                       key=f"delete_selected_{agent_id}", type="primary"):
+                            # Get index name from agent config - strict mode, no fallback
+                            index_name = agent_config.get('search_index')
+                            if not index_name:
+                                st.error(f"❌ No search index configured for agent '{agent_id}'. Please configure 'search_index' in agent settings.")
+                            elif len(pending_deletes) == 1:
+                                doc_name = next(iter(pending_deletes))
+                                deleted = client.delete_document(container_name, doc_name, index_name)
+                                # The blob may be gone even when the index update failed
+                                _invalidate_documents(container_name)
+                                if deleted:
+                                    st.session_state.pop(f"docs_table_{agent_id}", None)
+                                    st.success(f"✅ Deleted {doc_name}")
+                                    st.info("🔄 Reindexing triggered automatically")
+                                    st.rerun(scope="fragment")
+                                else:
+                                    st.error(f"❌ Failed to delete {doc_name} from index '{index_name}'")
                             else:
-                                st.write("🔒 No delete permission")
+                                with st.spinner("Seçilen dokümanlar siliniyor..."):
+                                    batch_result = client.delete_documents_batch(
+                                        container_name, sorted(pending_deletes), index_name)
+                                _invalidate_documents(container_name)
+                                if batch_result['failed']:
+                                    st.error(f"❌ {len(batch_result['failed'])} doküman silinemedi: {', '.join(batch_result['failed'])}")
+                                elif batch_result['index_failed']:
+                                    st.warning(f"⚠️ {len(batch_result['index_failed'])} doküman silindi ancak arama indeksinden kaldırılamadı: {', '.join(batch_result['index_failed'])}")
+                                    st.session_state.pop(f"docs_table_{agent_id}", None)
+                                else:
+                                    st.success(f"✅ {len(batch_result['deleted'])} doküman başarıyla silindi!")
+                                    # The table rows change, so drop the old row selection
+                                    st.session_state.pop(f"docs_table_{agent_id}", None)
+                                    st.rerun(scope="fragment")
             else:
                 if search_query:
                     st.info(f"🔍 '{search_query}' araması için sonuç bulunamadı")
@@ -1972,8 +2090,7 @@ def show_agent_settings(agent_config: Dict):
     # Test connection button
     if st.button("🔌 Test Connection", key=f"test_{agent_id}"):
         try:
-            from azure_utils import EnhancedAzureAIAgentClient, AzureConfig
-            config = AzureConfig()
+            config = _get_azure_config()
             client = EnhancedAzureAIAgentClient(
                 agent_config['connection_string'],
                 agent_config['agent_id'],
@@ -2014,6 +2131,46 @@ def show_settings():
     with tab3:
         show_system_settings_tab()
 
+def _permission_editor(names: List, ids: List, values: List, perm_keys: Dict, key: str) -> List[str]:
+    """Render the agent permission grid as a single data editor and return the granted permission keys"""
+    grid = pd.DataFrame({'Agent': names, **dict(zip(_PERMISSION_COLUMNS, values))}, index=ids)
+    edited = st.data_editor(grid, disabled=['Agent'], key=key, use_container_width=True)
+    
+    granted = []
+    for agent_id, row in zip(ids, edited[list(_PERMISSION_COLUMNS)].itertuples(index=False)):
+        granted.extend(perm_key for perm_key, checked in zip(perm_keys[agent_id], row) if checked)
+    return granted
+
+def _first_hex_color(color_value: str, default: str = '#FF6B6B') -> str:
+    """Return the first hex color of a color/gradient string, or the default"""
+    hex_match = _HEX6_RE.search(color_value) if color_value and '#' in color_value else None
+    return hex_match.group() if hex_match else default
+
+@lru_cache(maxsize=256)
+def _parse_categories(categories: str) -> tuple:
+    """Split a comma-separated categories field into stripped, non-empty names"""
+    return tuple(cat.strip() for cat in categories.split(",") if cat.strip())
+
+@st.cache_resource
+def _get_azure_config():
+    """Azure settings parsed once per process"""
+    return AzureConfig()
+
+@st.cache_resource
+def _get_blob_agent_manager():
+    """Shared blob agent manager, created once per process"""
+    return BlobStorageAgentManager(_get_azure_config())
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_agents() -> Dict:
+    """Agents from blob storage, cached until an agent mutation clears it (or the TTL expires)"""
+    return _get_blob_agent_manager().get_all_agents()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_users(_user_manager) -> Dict:
+    """Users from blob storage, cached until a user mutation clears it (or the TTL expires)"""
+    return _user_manager.get_all_users()
+
 def show_blob_user_management_tab():
     """Enhanced user management tab with blob storage integration"""
     st.subheader("📋 User Management (Blob Storage)")
@@ -2026,29 +2183,32 @@ def show_blob_user_management_tab():
     
     # Get current users from blob storage
     try:
-        users = st.session_state.user_manager.get_all_users()
+        users = _load_users(st.session_state.user_manager)
         
         # Ensure users is a dictionary
         if not isinstance(users, dict):
             st.error(f"❌ Invalid user data format. Expected dictionary, got {type(users)}")
             users = {}
-        # Exclude activity log users from the list
-        else:
-            users = {u: d for u, d in users.items() if not str(u).startswith("activiy_admin")}
+        # Exclude activity log users from the list (only copy when there is something to drop)
+        elif any(u.startswith("activiy_admin") for u in users):
+            users = {u: d for u, d in users.items() if not u.startswith("activiy_admin")}
     except Exception as e:
         st.error(f"❌ Error loading users: {e}")
         users = {}
     
     # Get agents from blob storage as well
-    from azure_utils import AzureConfig, BlobStorageAgentManager
     try:
-        # Initialize without any extra parameters
-        blob_agent_manager = BlobStorageAgentManager(AzureConfig())
-        agents = blob_agent_manager.get_all_agents()
+        agents = _load_agents()
     except Exception as e:
         st.error(f"Error loading agents from blob storage: {e}")
         agents = {}
     
+    # Iterate agents in a stable order so widget keys and layout don't shift between fetches
+    sorted_agents = sorted(agents.items(), key=lambda kv: kv[0])
+    
+    # "<agent_id>:<permission>" keys, built once per render instead of per cell
+    perm_keys = {aid: tuple(f"{aid}:{perm}" for perm in _PERMISSION_TYPES) for aid in agents}
+    
     # Add new user section
     with st.expander("➕ Add New User"):
         # Show success message from previous add (after rerun)
@@ -2067,35 +2227,20 @@ def show_blob_user_management_tab():
             new_role = st.selectbox("Role", ["standard", "admin"])
             
             st.write("**Agent Permissions:**")
-            new_permissions = {}
-            
-            for agent_id, agent_config in agents.items():
-                st.write(f"**{agent_config['name']} ({agent_id})**")
-                col1, col2, col3, col4, col5 = st.columns(5)
-                
-                with col1:
-                    access = st.checkbox(f"Access", key=f"blob_new_access_{agent_id}")
-                with col2:
-                    chat = st.checkbox(f"Chat", key=f"blob_new_chat_{agent_id}")
-                with col3:
-                    upload = st.checkbox(f"Upload", key=f"blob_new_upload_{agent_id}")
-                with col4:
-                    download = st.checkbox(f"Download", key=f"blob_new_download_{agent_id}")
-                with col5:
-                    delete = st.checkbox(f"Delete", key=f"blob_new_delete_{agent_id}")
-                
-                new_permissions[agent_id] = {
-                    'access': access,
-                    'chat': chat,
-                    'document_upload': upload,
-                    'document_download': download,
-                    'document_delete': delete
-                }
+            # Every agent starts with no permissions; the grid is one widget instead of 5 checkboxes per agent
+            new_permissions = _permission_editor(
+                [agent_config['name'] for _, agent_config in sorted_agents],
+                [agent_id for agent_id, _ in sorted_agents],
+                [[False] * len(sorted_agents) for _ in _PERMISSION_TYPES],
+                perm_keys,
+                key="blob_new_permissions"
+            )
             
             if st.form_submit_button("➕ Add User", type="primary"):
                 if new_username and new_username not in users:
                     # No password needed - users will authenticate with Azure AD
                     if st.session_state.user_manager.add_user(new_username, new_role, None, new_permissions):
+                        _load_users.clear()
                         # Store success state then rerun to show message cleanly
                         st.session_state["user_add_success"] = True
                         st.session_state["user_add_success_username"] = new_username
@@ -2116,154 +2261,186 @@ def show_blob_user_management_tab():
             if not isinstance(user_data, dict):
                 st.error(f"❌ Invalid user data for {username}: {type(user_data)}")
                 continue
-                
-            with st.expander(f"👤 {username} ({user_data.get('role', 'Unknown')}) - Created: {user_data.get('created_at', 'Unknown')[:10]}"):
-                col1, col2 = st.columns([3, 1])
-                
-                with col1:
-                    st.write(f"**Role:** {user_data.get('role', 'Unknown')}")
-                    st.write(f"**Created:** {user_data.get('created_at', 'Unknown')}")
-                    if user_data.get('updated_at'):
-                        st.write(f"**Last Updated:** {user_data.get('updated_at')}")
-            
-            with col2:
-                # Blob storage operations
-                if st.button(f"🔄 Refresh", key=f"refresh_{username}"):
-                    # Force reload from blob storage
-                    st.session_state.user_manager = st.session_state.user_manager.__class__()
-                    st.rerun()
+            _render_user_row(username, user_data, sorted_agents, perm_keys)
+
+@st.fragment
+def _render_user_row(username: str, user_data: Dict, sorted_agents: List, perm_keys: Dict):
+    """Render one user's details, permission matrix and edit form as an isolated fragment"""
+    with st.expander(f"👤 {username} ({user_data.get('role', 'Unknown')}) - Created: {user_data.get('created_at', 'Unknown')[:10]}"):
+        col1, col2 = st.columns([3, 1])
+        
+        with col1:
+            st.write(f"**Role:** {user_data.get('role', 'Unknown')}")
+            st.write(f"**Created:** {user_data.get('created_at', 'Unknown')}")
+            if user_data.get('updated_at'):
+                st.write(f"**Last Updated:** {user_data.get('updated_at')}")
+    
+    with col2:
+        # Blob storage operations
+        if st.button(f"🔄 Refresh", key=f"refresh_{username}"):
+            # Force reload from blob storage
+            st.session_state.user_manager = st.session_state.user_manager.__class__()
+            _load_users.clear()
+            st.rerun()
+    
+    if user_data.get('role') != 'admin':
+        st.write("**Agent Permissions:**")
+        
+        # Permission matrix, collected column by column
+        names, ids, access, chat, upload, download, delete = [], [], [], [], [], [], []
+        user_permissions = user_data.get('permissions', [])
+        
+        for agent_id, agent_config in sorted_agents:
+            keys = perm_keys[agent_id]
+            # Handle both new list format and old dictionary format
+            if isinstance(user_permissions, list):
+                # New list format
+                has_access = keys[0] in user_permissions or "access" in user_permissions
+                has_chat = keys[1] in user_permissions or "chat" in user_permissions
+                has_upload = keys[2] in user_permissions or "document_upload" in user_permissions
+                has_download = keys[3] in user_permissions or "document_download" in user_permissions
+                has_delete = keys[4] in user_permissions or "document_delete" in user_permissions
+            else:
+                # Old dictionary format (fallback)
+                user_perms = user_permissions.get(agent_id, {}) if isinstance(user_permissions, dict) else {}
+                has_access = user_perms.get('access', False)
+                has_chat = user_perms.get('chat', False)
+                has_upload = user_perms.get('document_upload', False)
+                has_download = user_perms.get('document_download', False)
+                has_delete = user_perms.get('document_delete', False)
             
-            if user_data.get('role') != 'admin':
-                st.write("**Agent Permissions:**")
-                
-                # Permission matrix
-                permission_data = []
-                user_permissions = user_data.get('permissions', [])
-                
-                for agent_id, agent_config in agents.items():
-                    # Handle both new list format and old dictionary format
-                    if isinstance(user_permissions, list):
-                        # New list format
-                        has_access = f"{agent_id}:access" in user_permissions or "access" in user_permissions
-                        has_chat = f"{agent_id}:chat" in user_permissions or "chat" in user_permissions
-                        has_upload = f"{agent_id}:document_upload" in user_permissions or "document_upload" in user_permissions
-                        has_download = f"{agent_id}:document_download" in user_permissions or "document_download" in user_permissions
-                        has_delete = f"{agent_id}:document_delete" in user_permissions or "document_delete" in user_permissions
-                    else:
-                        # Old dictionary format (fallback)
-                        user_perms = user_permissions.get(agent_id, {}) if isinstance(user_permissions, dict) else {}
-                        has_access = user_perms.get('access', False)
-                        has_chat = user_perms.get('chat', False)
-                        has_upload = user_perms.get('document_upload', False)
-                        has_download = user_perms.get('document_download', False)
-                        has_delete = user_perms.get('document_delete', False)
-                    
-                    permission_data.append({
-                        'Agent': agent_config['name'],
-                        'Agent ID': agent_id,
-                        'Access': '✅' if has_access else '❌',
-                        'Chat': '✅' if has_chat else '❌',
-                        'Upload': '✅' if has_upload else '❌',
-                        'Download': '✅' if has_download else '❌',
-                        'Delete': '✅' if has_delete else '❌'
-                    })
-                
-                if permission_data:
-                    df_perms = pd.DataFrame(permission_data)
-                    st.dataframe(df_perms)
-                else:
-                    st.info("No specific permissions set")
-                
-                # Edit permissions button
-                if st.button(f"✏️ Edit Permissions", key=f"edit_{username}"):
-                    st.session_state[f"editing_{username}"] = True
-                    st.rerun()
+            names.append(agent_config['name'])
+            ids.append(agent_id)
+            access.append(has_access)
+            chat.append(has_chat)
+            upload.append(has_upload)
+            download.append(has_download)
+            delete.append(has_delete)
+        
+        if ids:
+            df_perms = pd.DataFrame({
+                'Agent': names,
+                'Agent ID': ids,
+                'Access': ['✅' if v else '❌' for v in access],
+                'Chat': ['✅' if v else '❌' for v in chat],
+                'Upload': ['✅' if v else '❌' for v in upload],
+                'Download': ['✅' if v else '❌' for v in download],
+                'Delete': ['✅' if v else '❌' for v in delete]
+            })
+            st.dataframe(df_perms)
+        else:
+            st.info("No specific permissions set")
+        
+        # Edit permissions button
+        if st.button(f"✏️ Edit Permissions", key=f"edit_{username}"):
+            st.session_state[f"editing_{username}"] = True
+            st.rerun(scope="fragment")
+        
+        # Edit permissions form
+        if st.session_state.get(f"editing_{username}", False):
+            st.write("**Edit Permissions (Will save to blob storage):**")
+            with st.form(f"edit_perms_{username}"):
+                # Current permissions come from the matrix columns built above; saved in the new list format
+                updated_permissions = _permission_editor(
+                    names, ids, [access, chat, upload, download, delete], perm_keys,
+                    key=f"perm_editor_{username}"
+                )
                 
-                # Edit permissions form
-                if st.session_state.get(f"editing_{username}", False):
-                    st.write("**Edit Permissions (Will save to blob storage):**")
-                    with st.form(f"edit_perms_{username}"):
-                        updated_permissions = []  # Use list format for new system
-                        
-                        for agent_id, agent_config in agents.items():
-                            st.write(f"**{agent_config['name']} ({agent_id})**")
-                            col1, col2, col3, col4, col5 = st.columns(5)
-                            
-                            # Get current permissions in both formats
-                            user_permissions = user_data.get('permissions', [])
-                            if isinstance(user_permissions, list):
-                                # New list format
-                                current_access = f"{agent_id}:access" in user_permissions or "access" in user_permissions
-                                current_chat = f"{agent_id}:chat" in user_permissions or "chat" in user_permissions
-                                current_upload = f"{agent_id}:document_upload" in user_permissions or "document_upload" in user_permissions
-                                current_download = f"{agent_id}:document_download" in user_permissions or "document_download" in user_permissions
-                                current_delete = f"{agent_id}:document_delete" in user_permissions or "document_delete" in user_permissions
-                            else:
-                                # Old dictionary format (fallback)
-                                current_perms = user_permissions.get(agent_id, {}) if isinstance(user_permissions, dict) else {}
-                                current_access = current_perms.get('access', False)
-                                current_chat = current_perms.get('chat', False)
-                                current_upload = current_perms.get('document_upload', False)
-                                current_download = current_perms.get('document_download', False)
-                                current_delete = current_perms.get('document_delete', False)
-                            
-                            with col1:
-                                access = st.checkbox("Access", 
-                                                   value=current_access,
-                                                   key=f"edit_access_{username}_{agent_id}")
-                            with col2:
-                                chat = st.checkbox("Chat", 
-                                                 value=current_chat,
-                                                 key=f"edit_chat_{username}_{agent_id}")
-                            with col3:
-                                upload = st.checkbox("Upload", 
-                                                    value=current_upload,
-                                                    key=f"edit_upload_{username}_{agent_id}")
-                            with col4:
-                                download = st.checkbox("Download", 
-                                                      value=current_download,
-                                                      key=f"edit_download_{username}_{agent_id}")
-                            with col5:
-                                delete = st.checkbox("Delete", 
-                                                    value=current_delete,
-                                                    key=f"edit_delete_{username}_{agent_id}")
-                            
-                            # Build permission list in new format
-                            if access:
-                                updated_permissions.append(f"{agent_id}:access")
-                            if chat:
-                                updated_permissions.append(f"{agent_id}:chat")
-                            if upload:
-                                updated_permissions.append(f"{agent_id}:document_upload")
-                            if download:
-                                updated_permissions.append(f"{agent_id}:document_download")
-                            if delete:
-                                updated_permissions.append(f"{agent_id}:document_delete")
-                        
-                        col1, col2 = st.columns(2)
-                        with col1:
-                            if st.form_submit_button("💾 Save to Blob Storage", type="primary"):
-                                if st.session_state.user_manager.update_user_permissions(username, updated_permissions):
-                                    st.session_state[f"editing_{username}"] = False
-                                    st.success("✅ Permissions updated and saved to blob storage!")
-                                    st.rerun()
-                                else:
-                                    st.error("❌ Failed to save permissions to blob storage")
-                        with col2:
-                            if st.form_submit_button("❌ Cancel"):
-                                st.session_state[f"editing_{username}"] = False
-                                st.rerun()
+                col1, col2 = st.columns(2)
+                with col1:
+                    if st.form_submit_button("💾 Save to Blob Storage", type="primary"):
+                        if st.session_state.user_manager.update_user_permissions(username, updated_permissions):
+                            _load_users.clear()
+                            st.session_state[f"editing_{username}"] = False
+                            st.success("✅ Permissions updated and saved to blob storage!")
+                            st.rerun()
+                        else:
+                            st.error("❌ Failed to save permissions to blob storage")
+                with col2:
+                    if st.form_submit_button("❌ Cancel"):
+                        st.session_state[f"editing_{username}"] = False
+                        st.rerun(scope="fragment")
+    else:
+        st.success("👑 Full admin access to all agents and features")
+    
+    # Delete user button (except for admin)
+    if username != "admin":
+        if st.button(f"🗑️ Delete User (from Blob)", key=f"delete_{username}", type="secondary"):
+            if st.session_state.user_manager.delete_user(username):
+                _load_users.clear()
+                st.success(f"🗑️ User {username} deleted from blob storage!")
+                st.rerun()
             else:
-                st.success("👑 Full admin access to all agents and features")
-            
-            # Delete user button (except for admin)
-            if username != "admin":
-                if st.button(f"🗑️ Delete User (from Blob)", key=f"delete_{username}", type="secondary"):
-                    if st.session_state.user_manager.delete_user(username):
-                        st.success(f"🗑️ User {username} deleted from blob storage!")
-                        st.rerun()
-                    else:
-                        st.error("❌ Failed to delete user from blob storage")
+                st.error("❌ Failed to delete user from blob storage")
+
+
+def _patch_session_agent(agent_id: str, agent_config: Dict = None):
+    """Apply an agent change to the dashboard's session agents instead of reloading them all"""
+    session_agents = st.session_state.get("agents")
+    if not isinstance(session_agents, dict):
+        return
+    # Same visibility rule as BlobStorageAgentManager.get_active_agents
+    if agent_config is not None and (agent_config.get('status') == 'active' or
+                                     agent_config.get('enabled', True) or
+                                     'status' not in agent_config):
+        session_agents[agent_id] = agent_config
+    else:
+        session_agents.pop(agent_id, None)
+
+def _start_agent_edit_cb(agent_id: str):
+    """Open the edit form of an agent"""
+    st.session_state[f"editing_agent_{agent_id}"] = True
+
+def _cancel_agent_edit_cb(agent_id: str):
+    """Close the edit form of an agent"""
+    st.session_state[f"editing_agent_{agent_id}"] = False
+
+def _toggle_webjob_generator_cb(agent_id: str, expander_key: str):
+    """Toggle WebJob Generator visibility and keep the agent expander open"""
+    st.session_state[f"show_webjob_generator_{agent_id}"] = not st.session_state.get(
+        f"show_webjob_generator_{agent_id}", False
+    )
+    st.session_state[expander_key] = True
+
+def _set_agent_status_cb(agent_id: str, new_status: str):
+    """Persist a new agent status to blob storage"""
+    if _get_blob_agent_manager().set_agent_status(agent_id, new_status):
+        _load_agents.clear()
+        session_agents = st.session_state.get("agents")
+        if isinstance(session_agents, dict) and agent_id in session_agents:
+            # Patch the dashboard copy in place
+            session_agents[agent_id]["status"] = new_status
+        elif new_status == "active" and "agents" in st.session_state:
+            # Not in the dashboard copy yet, so let the dashboard reload it
+            del st.session_state["agents"]
+        st.toast(f"✅ Agent status updated to {new_status}")
+    else:
+        st.toast("❌ Failed to update agent status")
+
+def _delete_agent_cb(agent_id: str):
+    """Delete an agent from blob storage"""
+    if _get_blob_agent_manager().delete_agent(agent_id):
+        _load_agents.clear()
+        _patch_session_agent(agent_id)
+        st.toast(f"🗑️ Agent {agent_id} deleted from blob storage!")
+    else:
+        st.toast("❌ Failed to delete agent from blob storage")
+
+def _on_agent_action(agent_id: str, expander_key: str, new_status: str):
+    """Dispatch the action picked in an agent's segmented control"""
+    action_key = f"agent_actions_{agent_id}"
+    action = st.session_state.get(action_key)
+    # Reset the control so the same action can be picked again
+    st.session_state[action_key] = None
+    
+    if action == "edit":
+        _start_agent_edit_cb(agent_id)
+    elif action == "webjob":
+        _toggle_webjob_generator_cb(agent_id, expander_key)
+    elif action == "toggle":
+        _set_agent_status_cb(agent_id, new_status)
+    elif action == "delete":
+        _delete_agent_cb(agent_id)
 
 def show_blob_agent_configuration_tab():
     """Enhanced agent configuration tab with blob storage integration"""
@@ -2271,17 +2448,14 @@ def show_blob_agent_configuration_tab():
     
     # Check if Azure connection is available
     try:
-        # Get current agents from blob storage using AgentManager
-        from azure_utils import AzureConfig, BlobStorageAgentManager
-        # Initialize without any extra parameters
-        blob_agent_manager = BlobStorageAgentManager(AzureConfig())
-        agents = blob_agent_manager.get_all_agents()
+        # Get current agents from blob storage using the shared AgentManager
+        blob_agent_manager = _get_blob_agent_manager()
+        agents = _load_agents()
         
         # If no agents from blob storage, try backup configuration as fallback
         if not agents:
             backup_path = "config_backup/agent_configs.json"
             if os.path.exists(backup_path):
-                import json
                 with open(backup_path, 'r', encoding='utf-8') as f:
                     all_agents = json.load(f)
                 # Convert backup format to expected format with all required fields
@@ -2320,7 +2494,6 @@ def show_blob_agent_configuration_tab():
             backup_path = "config_backup/agent_configs.json"
             if os.path.exists(backup_path):
                 try:
-                    import json
                     with open(backup_path, 'r', encoding='utf-8') as f:
                         all_agents = json.load(f)
                     # Convert backup format to expected format with all required fields
@@ -2397,18 +2570,17 @@ def show_blob_agent_configuration_tab():
                         "container_name": new_container_name,
                         "search_index": new_search_index,
                         "color": new_agent_color,
-                        "categories": [cat.strip() for cat in new_categories.split(",") if cat.strip()],
+                        "categories": list(_parse_categories(new_categories)),
                         "agent_type": new_agent_type,
                         "data_container": new_data_container if new_agent_type == "Data Analyzer" else "",
                         "data_file": new_data_file if new_agent_type == "Data Analyzer" else ""
                     }
                     
                     if blob_agent_manager.add_agent(agent_config):
-                        # Clear session state agents to force refresh from blob storage on next dashboard visit
-                        if "agents" in st.session_state:
-                            del st.session_state["agents"]
+                        _load_agents.clear()
+                        # add_agent filled in status/timestamps, so the config can go straight to the dashboard
+                        _patch_session_agent(new_agent_id, agent_config)
                         st.success(f"✅ Agent '{new_agent_name}' added successfully and saved to blob storage!")
-                        st.success("🔄 Agent cache cleared - dashboard will show updated agents")
                         st.rerun()
                     else:
                         st.error("❌ Failed to add agent to blob storage")
@@ -2417,37 +2589,59 @@ def show_blob_agent_configuration_tab():
     
     # Display current agents
     st.markdown("---")
+    # Status dot styles, emitted once per run for all agents
+    st.markdown(_STATUS_DOT_CSS, unsafe_allow_html=True)
     
     for agent_id, agent_config in agents.items():
+        # Agent fields read once and reused by the header, details, WebJob generator and edit form
         status = agent_config.get('status', 'active')
-        status_icon = "🟢" if status == 'active' else "🔴"
+        name = agent_config.get('name', '')
+        icon = agent_config.get('icon', '🤖')
+        description = agent_config.get('description', '')
+        agent_type = agent_config.get('agent_type', 'Data Agent')
+        container_name = agent_config.get('container_name', '')
+        connection_string = agent_config.get('connection_string', '')
+        ai_agent_id = agent_config.get('agent_id', '')
+        categories = agent_config.get('categories', [])
+        data_container = agent_config.get('data_container', '')
+        data_file = agent_config.get('data_file', '')
+        status_icon = _AGENT_STATUS_ICONS.get(status, "🔴")
 
         # Keep expander state across reruns so Job Configuration panel stays visible
         expander_key = f"expand_agent_{agent_id}"
         is_expanded = st.session_state.get(expander_key, False)
 
         with st.expander(
-            f"{status_icon} {agent_config.get('icon', '🤖')} {agent_config.get('name', agent_id)} - Created: {agent_config.get('created_at', 'Unknown')[:10]}",
+            f"{status_icon} {icon} {name or agent_id} - Created: {agent_config.get('created_at', 'Unknown')[:10]}",
             expanded=is_expanded,
         ):
             col1, col2, col3 = st.columns([2, 2, 1])
             
+            # One markdown element per column instead of one st.write per field
             with col1:
-                st.write(f"**ID:** {agent_id}")
-                st.write(f"**Name:** {agent_config.get('name', 'N/A')}")
-                st.write(f"**Type:** {agent_config.get('agent_type', 'Data Agent')}")
-                st.write(f"**Description:** {agent_config.get('description', 'N/A')}")
-                st.write(f"**Status:** {status}")
+                status_class = "active" if status == "active" else "inactive"
+                st.markdown(
+                    f"**ID:** {agent_id}  \n"
+                    f"**Name:** {name or 'N/A'}  \n"
+                    f"**Type:** {agent_type}  \n"
+                    f"**Description:** {description or 'N/A'}  \n"
+                    f"**Status:** <span class='status-dot status-dot-{status_class}'></span>{status}",
+                    unsafe_allow_html=True
+                )
             
             with col2:
-                st.write(f"**Container:** {agent_config.get('container_name', 'N/A')}")
-                st.write(f"**AI Agent ID:** {agent_config.get('agent_id', 'N/A')}")
-                st.write(f"**Categories:** {', '.join(agent_config.get('categories', []))}")
-                
+                details = (
+                    f"**Container:** {container_name or 'N/A'}  \n"
+                    f"**AI Agent ID:** {ai_agent_id or 'N/A'}  \n"
+                    f"**Categories:** {', '.join(categories)}"
+                )
                 # Show data analyzer specific info
-                if agent_config.get('agent_type') == 'Data Analyzer':
-                    st.write(f"**Data Container:** {agent_config.get('data_container', 'N/A')}")
-                    st.write(f"**Data File:** {agent_config.get('data_file', 'N/A')}")
+                if agent_type == 'Data Analyzer':
+                    details += (
+                        f"  \n**Data Container:** {data_container or 'N/A'}"
+                        f"  \n**Data File:** {data_file or 'N/A'}"
+                    )
+                st.markdown(details)
                 
                 # WebJob ZIP Generator Section (replaces old job management)
                 
@@ -2455,87 +2649,71 @@ def show_blob_agent_configuration_tab():
                     st.markdown("#### � Azure WebJob Package Generator")
                     st.info("Generate a ready-to-deploy WebJob ZIP package for Azure App Service")
                     
-                    # WebJob configuration form
+                    # WebJob configuration form - reruns only on submit, not on every keystroke
                     try:
-                        from webjob_generator import create_webjob_package
-                        import time
-                        
-                        st.markdown("**Configure WebJob Package**")
-                        
-                        col1, col2 = st.columns(2)
+                        if create_webjob_package is None:
+                            raise ImportError("webjob_generator could not be imported")
                         
-                        with col1:
-                            webjob_schedule_type = st.selectbox(
-                                "Schedule Type",
-                                options=["manual", "scheduled"],
-                                index=0,
-                                help="Manual: Run manually when needed. Scheduled: Run automatically via cron expression.",
-                                key=f"webjob_schedule_{agent_id}"
-                            )
+                        with st.form(f"webjob_form_{agent_id}"):
+                            st.markdown("**Configure WebJob Package**")
+                            
+                            col1, col2 = st.columns(2)
                             
-                            webjob_cron = ""
-                            if webjob_schedule_type == "scheduled":
-                                st.markdown("**⏰ Schedule Configuration**")
+                            with col1:
+                                webjob_schedule_type = st.selectbox(
+                                    "Schedule Type",
+                                    options=["manual", "scheduled"],
+                                    index=0,
+                                    help="Manual: Run manually when needed. Scheduled: Run automatically via cron expression.",
+                                    key=f"webjob_schedule_{agent_id}"
+                                )
+                                
+                                # Widgets inside a form don't rerun on change, so the schedule fields are always shown
+                                st.markdown("**⏰ Schedule Configuration** (scheduled only)")
                                 schedule_preset = st.selectbox(
                                     "Schedule Preset",
-                                    options=[
-                                        "Custom",
-                                        "Every hour",
-                                        "Every day at 9 AM",
-                                        "Every Monday at 9 AM",
-                                        "First day of month at 9 AM"
-                                    ],
+                                    options=["Custom", *_WEBJOB_CRON_PRESETS],
                                     key=f"webjob_preset_{agent_id}"
                                 )
                                 
-                                if schedule_preset == "Custom":
-                                    webjob_cron = st.text_input(
-                                        "Cron Expression",
-                                        value="0 0 9 * * *",
-                                        help="Format: second minute hour day month weekday",
-                                        key=f"webjob_cron_{agent_id}"
-                                    )
-                                elif schedule_preset == "Every hour":
-                                    webjob_cron = "0 0 * * * *"
-                                elif schedule_preset == "Every day at 9 AM":
-                                    webjob_cron = "0 0 9 * * *"
-                                elif schedule_preset == "Every Monday at 9 AM":
-                                    webjob_cron = "0 0 9 * * 1"
-                                else:  # First day of month
-                                    webjob_cron = "0 0 9 1 * *"
+                                custom_cron = st.text_input(
+                                    "Cron Expression",
+                                    value="0 0 9 * * *",
+                                    help="Used with the Custom preset. Format: second minute hour day month weekday",
+                                    key=f"webjob_cron_{agent_id}"
+                                )
+                            
+                            with col2:
+                                webjob_data_container = st.text_input(
+                                    "Data Container",
+                                    value=data_container,
+                                    placeholder="sales-data",
+                                    help="Blob container containing data files to process",
+                                    key=f"webjob_container_{agent_id}"
+                                )
                                 
-                                st.code(f"Cron: {webjob_cron}", language="text")
-                        
-                        with col2:
-                            webjob_data_container = st.text_input(
-                                "Data Container",
-                                value=agent_config.get('data_container', ''),
-                                placeholder="sales-data",
-                                help="Blob container containing data files to process",
-                                key=f"webjob_container_{agent_id}"
-                            )
+                                webjob_data_files = st.text_area(
+                                    "Data Files (one per line)",
+                                    value=data_file,
+                                    placeholder="Sales_Raw_Data_Final_v2.xlsx\nMonthly_Report.xlsx",
+                                    help="List of files to process in the WebJob",
+                                    key=f"webjob_files_{agent_id}"
+                                )
                             
-                            webjob_data_files = st.text_area(
-                                "Data Files (one per line)",
-                                value=agent_config.get('data_file', ''),
-                                placeholder="Sales_Raw_Data_Final_v2.xlsx\nMonthly_Report.xlsx",
-                                help="List of files to process in the WebJob",
-                                key=f"webjob_files_{agent_id}"
-                            )
-                        
-                        st.markdown("---")
+                            # Generate button
+                            generate_webjob = st.form_submit_button("🎯 Generate WebJob ZIP Package", type="primary")
                         
-                        # Generate button
-                        if st.button("🎯 Generate WebJob ZIP Package", type="primary", key=f"generate_webjob_{agent_id}"):
+                        if generate_webjob:
+                            webjob_cron = _WEBJOB_CRON_PRESETS.get(schedule_preset, custom_cron)
                             if webjob_data_container and webjob_data_files:
                                 with st.spinner("📦 Generating WebJob package..."):
                                     # Parse data files
-                                    data_files_list = [f.strip() for f in webjob_data_files.split('\n') if f.strip()]
+                                    data_files_list = list(filter(None, (f.strip() for f in webjob_data_files.splitlines())))
                                     
                                     # Get agent's Azure AI connection info from config
                                     # Agent config'de 'connection_string' ve 'agent_id' key'leri var
-                                    azure_ai_connection_string = agent_config.get('connection_string', '')
-                                    azure_ai_agent_id = agent_config.get('agent_id', '')
+                                    azure_ai_connection_string = connection_string
+                                    azure_ai_agent_id = ai_agent_id
                                     
                                     if not azure_ai_connection_string or not azure_ai_agent_id:
                                         st.error("❌ Agent configuration is missing Azure AI connection info!")
@@ -2547,7 +2725,7 @@ def show_blob_agent_configuration_tab():
                                         # Prepare configuration
                                         webjob_config = {
                                             'agent_id': agent_id,
-                                            'agent_name': agent_config.get('name', agent_id),
+                                            'agent_name': name or agent_id,
                                             'azure_ai_project_connection_string': azure_ai_connection_string,
                                             'azure_ai_agent_id': azure_ai_agent_id,
                                             'data_container': webjob_data_container,
@@ -2558,91 +2736,78 @@ def show_blob_agent_configuration_tab():
                                         
                                         # Generate package
                                         zip_bytes = create_webjob_package(webjob_config)
-                                    
-                                    if zip_bytes:
-                                        st.success("✅ WebJob package generated successfully!")
-                                        
-                                        # Provide download button
-                                        filename = f"webjob_{agent_id}_{int(time.time())}.zip"
-                                        st.download_button(
-                                            label="� Download WebJob ZIP Package",
-                                            data=zip_bytes,
-                                            file_name=filename,
-                                            mime="application/zip",
-                                            key=f"download_webjob_{agent_id}_{int(time.time())}"
-                                        )
                                         
-                                        st.info("""
-                                        **📋 Next Steps:**
-                                        1. ⬇️ Download the ZIP package above
-                                        2. 🌐 Go to Azure Portal > Your Web App > WebJobs
-                                        3. ➕ Click 'Add' and upload this ZIP file
-                                        4. ⚙️ Configure environment variables (AZURE_STORAGE_CONNECTION_STRING)
-                                        5. ▶️ Run or schedule the WebJob as needed
-                                        
-                                        📖 The package includes complete deployment instructions in README.md
-                                        """)
-                                    else:
-                                        st.error("❌ Failed to generate WebJob package")
+                                        if zip_bytes:
+                                            # Kept in session state: download buttons can't live inside a form
+                                            st.session_state[f"webjob_zip_{agent_id}"] = (
+                                                f"webjob_{agent_id}_{int(time.time())}.zip", zip_bytes
+                                            )
+                                            st.success("✅ WebJob package generated successfully!")
+                                            if webjob_schedule_type == "scheduled":
+                                                st.code(f"Cron: {webjob_cron}", language="text")
+                                        else:
+                                            st.error("❌ Failed to generate WebJob package")
                             else:
                                 st.error("❌ Please fill in Data Container and Data Files")
+                        
+                        webjob_package = st.session_state.get(f"webjob_zip_{agent_id}")
+                        if webjob_package:
+                            filename, zip_bytes = webjob_package
+                            
+                            # Provide download button
+                            st.download_button(
+                                label="� Download WebJob ZIP Package",
+                                data=zip_bytes,
+                                file_name=filename,
+                                mime="application/zip",
+                                key=f"download_webjob_{agent_id}"
+                            )
+                            
+                            st.info("""
+                            **📋 Next Steps:**
+                            1. ⬇️ Download the ZIP package above
+                            2. 🌐 Go to Azure Portal > Your Web App > WebJobs
+                            3. ➕ Click 'Add' and upload this ZIP file
+                            4. ⚙️ Configure environment variables (AZURE_STORAGE_CONNECTION_STRING)
+                            5. ▶️ Run or schedule the WebJob as needed
+                            
+                            📖 The package includes complete deployment instructions in README.md
+                            """)
                     
                     except Exception as webjob_error:
+                        logger.exception("WebJob package generation failed for %s", agent_id)
                         st.error(f"❌ WebJob generator error: {webjob_error}")
                         st.info("💡 WebJob generator requires webjob_generator module")
             
-            # Action buttons in a horizontal row
-            button_col1, button_col2, button_col3, button_col4 = st.columns(4)
-            
-            with button_col1:
-                if st.button(f"✏️ Edit Agent", key=f"edit_agent_{agent_id}"):
-                    st.session_state[f"editing_agent_{agent_id}"] = True
-                    st.rerun()
-            
-            with button_col2:
-                if st.button("� WebJob Generator", key=f"show_webjob_gen_{agent_id}"):
-                    # Toggle WebJob Generator visibility
-                    st.session_state[f"show_webjob_generator_{agent_id}"] = not st.session_state.get(
-                        f"show_webjob_generator_{agent_id}", False
-                    )
-                    st.session_state[expander_key] = True
-                    st.rerun()
-            
-            with button_col3:
-                # Status toggle
-                new_status = "inactive" if status == "active" else "active"
-                if st.button(f"{'⏸️' if status == 'active' else '▶️'} {new_status.title()}", key=f"toggle_{agent_id}"):
-                    if blob_agent_manager.set_agent_status(agent_id, new_status):
-                        # Clear session state agents to force refresh
-                        if "agents" in st.session_state:
-                            del st.session_state["agents"]
-                        st.success(f"✅ Agent status updated to {new_status}")
-                        st.rerun()
-                    else:
-                        st.error("❌ Failed to update agent status")
-            
-            with button_col4:
-                # Delete agent
-                if st.button(f"🗑️ Delete", key=f"delete_agent_{agent_id}", type="secondary"):
-                    if blob_agent_manager.delete_agent(agent_id):
-                        # Clear session state agents to force refresh
-                        if "agents" in st.session_state:
-                            del st.session_state["agents"]
-                        st.success(f"🗑️ Agent {agent_id} deleted from blob storage!")
-                        st.rerun()
-                    else:
-                        st.error("❌ Failed to delete agent from blob storage")
+            # Agent actions as one segmented control; the callback runs before the next render
+            new_status = "inactive" if status == "active" else "active"
+            action_labels = {
+                "edit": "✏️ Edit Agent",
+                "webjob": "� WebJob Generator",
+                "toggle": f"{_TOGGLE_ICONS.get(status, '▶️')} {new_status.title()}",
+                "delete": "🗑️ Delete"
+            }
+            st.segmented_control(
+                "Actions",
+                options=list(action_labels),
+                format_func=action_labels.get,
+                default=None,
+                key=f"agent_actions_{agent_id}",
+                on_change=_on_agent_action,
+                args=(agent_id, expander_key, new_status),
+                label_visibility="collapsed"
+            )
             
             if st.session_state.get(f"editing_agent_{agent_id}", False):
                 st.write("**Edit Agent Configuration (Will save to blob storage):**")
-                with st.form(f"edit_agent_{agent_id}"):
+                with st.form(f"edit_agent_form_{agent_id}"):
                     col1, col2 = st.columns(2)
                     
                     with col1:
-                        edit_name = st.text_input("Name", value=agent_config.get('name', ''))
+                        edit_name = st.text_input("Name", value=name)
                         
                         # Agent Type Selection
-                        current_agent_type = agent_config.get('agent_type', 'Data Agent')
+                        current_agent_type = agent_type
                         edit_agent_type = st.selectbox(
                             "Agent Type",
                             options=["Data Agent", "Data Analyzer"],
@@ -2652,32 +2817,22 @@ def show_blob_agent_configuration_tab():
                         )
                         
                         # Icon selector for editing
-                        current_icon = agent_config.get('icon', '🤖')
+                        current_icon = icon
                         edit_icon = show_icon_selector(default_icon=current_icon, key=f"edit_agent_{agent_id}")
                         
                         # Extract valid hex color from gradient or use default
-                        color_value = agent_config.get('color', '#FF6B6B')
-                        if color_value and '#' in color_value:
-                            # Extract first hex color from gradient
-                            import re
-                            hex_match = re.search(r'#[0-9a-fA-F]{6}', color_value)
-                            if hex_match:
-                                color_value = hex_match.group()
-                            else:
-                                color_value = '#FF6B6B'
-                        else:
-                            color_value = '#FF6B6B'
+                        color_value = _first_hex_color(agent_config.get('color', '#FF6B6B'))
                         edit_color = st.color_picker("Color", value=color_value)
                     
                     with col2:
-                        edit_description = st.text_area("Description", value=agent_config.get('description', ''))
+                        edit_description = st.text_area("Description", value=description)
                         edit_connection_string = st.text_input("Connection String", 
-                                                             value=agent_config.get('connection_string', ''),
+                                                             value=connection_string,
                                                              placeholder="Azure AI connection string")
                         edit_agent_ai_id = st.text_input("AI Agent ID", 
-                                                        value=agent_config.get('agent_id', ''),
+                                                        value=ai_agent_id,
                                                         placeholder="Assistant ID")
-                        edit_container = st.text_input("Container Name", value=agent_config.get('container_name', ''))
+                        edit_container = st.text_input("Container Name", value=container_name)
                         edit_search_index = st.text_input("Search Index", value=agent_config.get('search_index', ''), 
                                                         help="Index name for search functionality")
                         edit_send_user_info = st.checkbox("Kullanıcı Bilgilerini Agent a Gönder", 
@@ -2685,11 +2840,11 @@ def show_blob_agent_configuration_tab():
                                                            help="İşaretlenirse: giriş yapan kullanıcının Ad Soyad ve Email bilgisi her prompt'a eklenir.")
                         
                         # Data Analyzer configuration fields removed from edit form
-                        edit_data_container = agent_config.get('data_container', '')
-                        edit_data_file = agent_config.get('data_file', '')
+                        edit_data_container = data_container
+                        edit_data_file = data_file
                     
                     edit_categories = st.text_input("Categories (comma-separated)", 
-                                                  value=', '.join(agent_config.get('categories', [])))
+                                                  value=', '.join(categories))
                     
                     col1, col2 = st.columns(2)
                     with col1:
@@ -2704,26 +2859,23 @@ def show_blob_agent_configuration_tab():
                                 "container_name": edit_container,
                                 "search_index": edit_search_index,
                                 "color": edit_color,
-                                "categories": [cat.strip() for cat in edit_categories.split(",") if cat.strip()],
+                                "categories": list(_parse_categories(edit_categories)),
                                 "agent_type": edit_agent_type,
                                 # data_container/data_file intentionally not modified via UI
                                 "send_user_info": edit_send_user_info
                             })
                             
                             if blob_agent_manager.update_agent(agent_id, updated_config):
+                                _load_agents.clear()
                                 st.session_state[f"editing_agent_{agent_id}"] = False
-                                # Clear session state agents to force refresh
-                                if "agents" in st.session_state:
-                                    del st.session_state["agents"]
+                                _patch_session_agent(agent_id, updated_config)
                                 st.success("✅ Agent configuration updated and saved to blob storage!")
-                                st.success("🔄 Agent cache cleared - dashboard will show updated agents")
                                 st.rerun()
                             else:
                                 st.error("❌ Failed to save agent configuration to blob storage")
                     with col2:
-                        if st.form_submit_button("❌ Cancel"):
-                            st.session_state[f"editing_agent_{agent_id}"] = False
-                            st.rerun()
+                        # The callback closes the form before the submit's own rerun
+                        st.form_submit_button("❌ Cancel", on_click=_cancel_agent_edit_cb, args=(agent_id,))
     
 def show_agent_configuration_tab():
     """Agent configuration tab content"""
@@ -2947,9 +3099,49 @@ def show_agent_configuration_tab():
             else:
                 st.error("❌ Please fill in all required fields")
 
+def _users_frame(user_manager) -> pd.DataFrame:
+    """Users table for the system settings tab, without the activity log users"""
+    # Built from the _load_users cache, so every user mutation that clears it shows up here
+    users = _load_users(user_manager)
+    if not isinstance(users, dict):
+        users = {}
+    rows = []
+    for u, d in users.items():
+        if str(u).startswith("activiy_admin"):
+            continue
+        rows.append((u, d.get("role", "unknown"), d.get("created_at", "unknown"), len(d.get("permissions", []))))
+    return pd.DataFrame(rows, columns=["Username", "Role", "Created", "Permissions Count"])
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _azure_env_snapshot() -> str:
+    """Masked Azure environment settings, formatted for the settings tab"""
+    _cid = os.environ.get("AZURE_CLIENT_ID", "NOT_SET")
+    _tid = os.environ.get("AZURE_TENANT_ID", "NOT_SET")
+    _redir = os.environ.get("REDIRECT_URI", "NOT_SET")
+    _mi = os.environ.get("USE_MANAGED_IDENTITY", "false")
+    _acct = os.environ.get("AZURE_STORAGE_ACCOUNT_NAME", "-")
+    _cstr = os.environ.get("AZURE_STORAGE_CONNECTION_STRING", "-")
+    _sec = os.environ.get("AZURE_CLIENT_SECRET")
+    _sec_mask = (_sec[:4] + "..." + _sec[-4:]) if _sec and len(_sec) > 12 else ("SET" if _sec else "NOT_SET")
+    return f"""
+AZURE_CLIENT_ID={_cid}
+AZURE_CLIENT_SECRET={_sec_mask}
+AZURE_TENANT_ID={_tid}
+REDIRECT_URI={_redir}
+USE_MANAGED_IDENTITY={_mi}
+AZURE_STORAGE_ACCOUNT_NAME={_acct}
+AZURE_STORAGE_CONNECTION_STRING={(_cstr[:30] + '...') if _cstr and len(_cstr)>40 else _cstr}
+        """
+
+def _shift_users_page_cb(delta: int, page_count: int):
+    """Move the system settings users table by one page, staying within [0, page_count - 1]"""
+    page = st.session_state.get("_users_df_page", 0) + delta
+    st.session_state["_users_df_page"] = max(0, min(page, page_count - 1))
+
 def show_system_settings_tab():
     """System settings tab content"""
     st.subheader("🔧 System Settings")
+    user_df = None
     
     # User Management (only for admins)
     if st.session_state.user_role == "admin":
@@ -2963,26 +3155,28 @@ def show_system_settings_tab():
         
         # User list
         try:
-            users = st.session_state.user_manager.get_all_users()
-            # Exclude activity log users
-            if isinstance(users, dict):
-                users = {u: d for u, d in users.items() if not str(u).startswith("activiy_admin")}
+            user_df = _users_frame(st.session_state.user_manager)
         except Exception as e:
             st.error(f"❌ Error loading users: {e}")
-            users = {}
         
-        if users:
+        if user_df is not None and not user_df.empty:
             st.write("**Current Users:**")
-            user_df = pd.DataFrame([
-                {
-                    "Username": username,
-                    "Role": user_data.get("role", "unknown"),
-                    "Created": user_data.get("created_at", "unknown"),
-                    "Permissions Count": len(user_data.get("permissions", []))
-                }
-                for username, user_data in users.items()
-            ])
-            st.dataframe(user_df)
+            page_count = -(-len(user_df) // _USERS_PAGE_SIZE)
+            # The list may have shrunk since the page was chosen, so clamp the stored value too
+            page = min(st.session_state.setdefault("_users_df_page", 0), page_count - 1)
+            st.session_state["_users_df_page"] = page
+            start = page * _USERS_PAGE_SIZE
+            st.dataframe(user_df.iloc[start:start + _USERS_PAGE_SIZE])
+            if page_count > 1:
+                col1, col2, col3 = st.columns([1, 2, 1])
+                with col1:
+                    st.button("◀️ Prev", key="users_page_prev", disabled=page == 0,
+                              on_click=_shift_users_page_cb, args=(-1, page_count))
+                with col2:
+                    st.caption(f"Page {page + 1} / {page_count} ({len(user_df)} users)")
+                with col3:
+                    st.button("Next ▶️", key="users_page_next", disabled=page >= page_count - 1,
+                              on_click=_shift_users_page_cb, args=(1, page_count))
         
         # Actions for user management are now centralized in the User Management tab
         st.info("ℹ️ Kullanıcı ekleme/düzenleme/silme ve sistem sıfırlama işlemleri 'User Management' sekmesine taşındı.")
@@ -2991,24 +3185,7 @@ def show_system_settings_tab():
     st.write("### ☁️ Azure Configuration")
     with st.expander("Azure Service Settings"):
         st.write("**Current Azure Configuration:**")
-        import os as _os
-        _cid = _os.environ.get("AZURE_CLIENT_ID", "NOT_SET")
-        _tid = _os.environ.get("AZURE_TENANT_ID", "NOT_SET")
-        _redir = _os.environ.get("REDIRECT_URI", "NOT_SET")
-        _mi = _os.environ.get("USE_MANAGED_IDENTITY", "false")
-        _acct = _os.environ.get("AZURE_STORAGE_ACCOUNT_NAME", "-")
-        _cstr = _os.environ.get("AZURE_STORAGE_CONNECTION_STRING", "-")
-        _sec = _os.environ.get("AZURE_CLIENT_SECRET")
-        _sec_mask = (_sec[:4] + "..." + _sec[-4:]) if _sec and len(_sec) > 12 else ("SET" if _sec else "NOT_SET")
-        st.code(f"""
-AZURE_CLIENT_ID={_cid}
-AZURE_CLIENT_SECRET={_sec_mask}
-AZURE_TENANT_ID={_tid}
-REDIRECT_URI={_redir}
-USE_MANAGED_IDENTITY={_mi}
-AZURE_STORAGE_ACCOUNT_NAME={_acct}
-AZURE_STORAGE_CONNECTION_STRING={(_cstr[:30] + '...') if _cstr and len(_cstr)>40 else _cstr}
-        """)
+        st.code(_azure_env_snapshot())
 
         st.info("💡 Azure configuration is managed through environment variables. Contact your system administrator to modify these settings.")
     
@@ -3049,7 +3226,12 @@ AZURE_STORAGE_CONNECTION_STRING={(_cstr[:30] + '...') if _cstr and len(_cstr)>40
         agents_count = len(st.session_state.get("agents", {}))
         st.metric("Total Agents", agents_count)
     with col2:
-        users_count = len(st.session_state.user_manager.get_all_users()) if st.session_state.user_manager else 0
+        if user_df is None and st.session_state.user_manager:
+            try:
+                user_df = _users_frame(st.session_state.user_manager)
+            except Exception:
+                user_df = None
+        users_count = len(user_df) if user_df is not None else 0
         st.metric("Total Users", users_count)
     with col3:
         st.metric("Active Sessions", 1)  # This would be dynamic in a real app
@@ -3060,15 +3242,19 @@ AZURE_STORAGE_CONNECTION_STRING={(_cstr[:30] + '...') if _cstr and len(_cstr)>40
     
     with col1:
         if st.button("📥 Export Configuration", type="secondary"):
-            import json
             config_data = {
                 "agents": st.session_state.get("agents", {}),
                 "users": st.session_state.user_manager.get_all_users() if st.session_state.user_manager else {},
                 "settings": st.session_state.get("app_settings", {})
             }
+            if orjson is not None:
+                config_bytes = orjson.dumps(config_data)
+            else:
+                # ensure_ascii=False writes raw UTF-8 like orjson, so both paths give the same file
+                config_bytes = json.dumps(config_data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
             st.download_button(
                 label="💾 Download Config",
-                data=json.dumps(config_data, indent=2),
+                data=config_bytes,
                 file_name=f"azure_ai_config_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                 mime="application/json"
             )
@@ -3077,283 +3263,53 @@ AZURE_STORAGE_CONNECTION_STRING={(_cstr[:30] + '...') if _cstr and len(_cstr)>40
         uploaded_config = st.file_uploader("📤 Import Configuration", type="json")
         if uploaded_config and st.button("🔄 Restore Configuration"):
             try:
-                import json
                 config_data = json.load(uploaded_config)
+                restored = False
                 
                 if "agents" in config_data:
                     # Ensure we always have a dictionary format
                     agents_data = config_data["agents"]
                     if isinstance(agents_data, dict):
                         st.session_state.agents = agents_data
+                        restored = True
                     elif isinstance(agents_data, list):
                         # Convert list to dict if needed (legacy format)
                         st.session_state.agents = {f"agent_{i}": agent for i, agent in enumerate(agents_data)}
+                        restored = True
                     else:
                         st.warning("Invalid agents format in configuration file")
                         st.session_state.agents = {}
                 if "users" in config_data and st.session_state.user_manager is not None:
                     # For blob storage user manager, we need to update users individually
                     try:
-                        existing_users = st.session_state.user_manager.get_all_users()
-                        for username, user_data in config_data["users"].items():
-                            if username not in existing_users:
-                                st.session_state.user_manager.add_user(
-                                    username, 
-                                    user_data.get("role", "standard"),
-                                    user_data.get("permissions", {})
-                                )
+                        user_manager = st.session_state.user_manager
+                        existing_users = set(user_manager.get_all_users())
+                        missing_users = [(username, user_data) for username, user_data in config_data["users"].items()
+                                         if username not in existing_users]
+                        if missing_users:
+                            # Each add_user is a blob write; issue them concurrently
+                            with ThreadPoolExecutor(max_workers=min(8, len(missing_users))) as executor:
+                                list(executor.map(
+                                    lambda item: user_manager.add_user(
+                                        item[0],
+                                        item[1].get("role", "standard"),
+                                        None,  # Passwords are not part of the export
+                                        item[1].get("permissions", [])
+                                    ),
+                                    missing_users
+                                ))
+                            _load_users.clear()
+                            restored = True
                     except Exception as e:
                         st.error(f"❌ Error importing users: {e}")
                 elif "users" in config_data:
                     st.warning("⚠️ Cannot import users: User management is disabled due to Azure connection issues.")
                 if "settings" in config_data:
                     st.session_state.app_settings = config_data["settings"]
+                    restored = True
                 
                 st.success("✅ Configuration restored successfully!")
-                st.rerun()
+                if restored:
+                    st.rerun()
             except Exception as e:
                 st.error(f"❌ Error restoring configuration: {str(e)}")
-
-def show_azure_ai_agents_list():
-    """Display available Azure AI agents from Azure AI Projects"""
-    st.subheader("🤖 Available Azure AI Agents")
-    
-    try:
-        # Get Azure configuration
-        from azure_utils import AzureConfig, EnhancedAzureAIAgentClient
-        config = AzureConfig()
-        
-        # Create a client to list agents
-        client = EnhancedAzureAIAgentClient("", "", config, "")  # Pass empty container name
-        agents = client.get_available_agents()
-        
-        if agents:
-            st.success(f"✅ Found {len(agents)} Azure AI agents")
-            
-            # Display agents in cards
-            for agent in agents:
-                with st.expander(f"🤖 {agent['name']} (ID: {agent['id'][:12]}...)"):
-                    col1, col2 = st.columns([2, 1])
-                    
-                    with col1:
-                        st.write(f"**Model:** {agent.get('model', 'Unknown')}")
-                        st.write(f"**Description:** {agent.get('description', 'No description')}")
-                        if agent.get('instructions'):
-                            st.write(f"**Instructions:** {agent['instructions'][:100]}...")
-                        
-                        # Created date
-                        if agent.get('created_at'):
-                            try:
-                                import datetime
-                                created_date = datetime.datetime.fromtimestamp(agent['created_at'])
-                                st.write(f"**Created:** {created_date.strftime('%Y-%m-%d %H:%M')}")
-                            except:
-                                st.write(f"**Created:** {agent['created_at']}")
-                    
-                    with col2:
-                        st.write("**Agent ID:**")
-                        st.code(agent['id'], language="text")
-                        
-                        if st.button(f"Select Agent", key=f"select_{agent['id']}"):
-                            st.session_state.selected_agent_id = agent['id']
-                            st.success(f"✅ Selected agent: {agent['name']}")
-                            st.rerun()
-                            
-        else:
-            st.warning("⚠️ No Azure AI agents found. Please create agents in Azure AI Projects first.")
-            st.info("💡 You can create agents in the Azure AI Projects portal.")
-            
-    except Exception as e:
-        st.error(f"❌ Error connecting to Azure AI Projects: {str(e)}")
-        st.info("💡 Please check your Azure AI Projects configuration in the environment settings.")
-
-def show_azure_ai_agents_list():
-    """Display available Azure AI agents from Azure AI Projects"""
-    try:
-        from azure_utils import AzureConfig, EnhancedAzureAIAgentClient
-        
-        # Try to get a working AI client
-        azure_config = AzureConfig()
-        
-        # Create a test client with working configuration
-        try:
-            ai_client = EnhancedAzureAIAgentClient(
-                connection_string="test",  # Will be ignored in direct initialization
-                agent_id="test",  # Will be ignored
-                config=azure_config,
-                container_name=""  # Pass empty container name
-            )
-            
-            # Get available agents
-            azure_agents = ai_client.get_available_agents()
-            
-            if azure_agents:
-                st.success(f"✅ Found {len(azure_agents)} Azure AI agents")
-                
-                # Display agents in cards
-                cols = st.columns(min(len(azure_agents), 3))
-                for i, agent in enumerate(azure_agents):
-                    with cols[i % 3]:
-                        with st.container():
-                            st.markdown(f"""
-                            <div class="agent-card">
-                                <div class="agent-icon">🤖</div>
-                                <div class="agent-title">{agent['name']}</div>
-                                <div class="agent-description">{agent['description']}</div>
-                                <div class="agent-stats">
-                                    <strong>ID:</strong> {agent['id'][:20]}...<br>
-                                    <strong>Model:</strong> {agent['model']}<br>
-                                    <strong>Created:</strong> {datetime.fromtimestamp(agent['created_at']).strftime('%Y-%m-%d') if agent['created_at'] else 'Unknown'}
-                                </div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            
-                            if st.button(f"Open {agent['name']}", key=f"open_azure_{agent['id']}"):
-                                # Set up the agent for chat
-                                st.session_state.selected_agent = {
-                                    'id': agent['id'],
-                                    'name': agent['name'],
-                                    'type': 'azure_ai_projects',
-                                    'agent_id': agent['id'],
-                                    'connection_string': 'azure_ai_projects',
-                                    'description': agent['description']
-                                }
-                                st.session_state.current_page = "agent_interface"
-                                st.rerun()
-            else:
-                st.warning("⚠️ No Azure AI agents found. Please create agents in Azure AI Projects first.")
-                st.info("💡 You can create agents in the Azure AI Projects portal.")
-                
-        except Exception as client_error:
-            st.error(f"❌ Error connecting to Azure AI Projects: {client_error}")
-            st.info("💡 Please check your Azure AI Projects configuration.")
-            
-    except ImportError:
-        st.error("❌ Azure utilities not available")
-    except Exception as e:
-        st.error(f"❌ Error loading Azure AI agents: {e}")
-
-def show_connection_status():
-    """Show Azure services connection status"""
-    st.subheader("🔗 Azure Services Status")
-    
-    try:
-        from azure_utils import AzureConfig
-        config = AzureConfig()
-        
-        # Test Azure services
-        status_data = []
-        
-        # Test Blob Storage
-        try:
-            from azure.storage.blob import BlobServiceClient
-            if config.storage_connection_string and "DefaultEndpointsProtocol" in config.storage_connection_string:
-                blob_client = BlobServiceClient.from_connection_string(config.storage_connection_string)
-                containers = list(blob_client.list_containers())
-                status_data.append({"Service": "Azure Blob Storage", "Status": "✅ Connected", "Details": f"{len(containers)} containers"})
-            else:
-                status_data.append({"Service": "Azure Blob Storage", "Status": "❌ Not configured", "Details": "Missing connection string"})
-        except Exception as e:
-            status_data.append({"Service": "Azure Blob Storage", "Status": "❌ Error", "Details": str(e)[:50]})
-        
-        # Test Azure Search
-        try:
-            if config.search_endpoint and config.search_admin_key:
-                from azure.search.documents.indexes import SearchIndexClient
-                from azure.core.credentials import AzureKeyCredential
-                
-                # Add timeout and retry configuration
-                from azure.core.pipeline.policies import RetryPolicy
-                search_client = SearchIndexClient(
-                    endpoint=config.search_endpoint,
-                    credential=AzureKeyCredential(config.search_admin_key),
-                    retry_policy=RetryPolicy(total_retries=1)
-                )
-                
-                # Use timeout for the list operation
-                try:
-                    indexes = list(search_client.list_indexes())
-                    index_names = [idx.name for idx in indexes if hasattr(idx, 'name')]
-                    status_data.append({"Service": "Azure AI Search", "Status": "✅ Connected", "Details": f"{len(indexes)} indexes: {', '.join(index_names[:2])}"})
-                except Exception as list_error:
-                    # If listing fails, try a simpler connectivity test
-                    status_data.append({"Service": "Azure AI Search", "Status": "⚠️ Limited", "Details": f"Connected but listing failed: {str(list_error)[:50]}"})
-            else:
-                status_data.append({"Service": "Azure AI Search", "Status": "❌ Not configured", "Details": "Missing endpoint/key"})
-        except Exception as e:
-            status_data.append({"Service": "Azure AI Search", "Status": "❌ Error", "Details": str(e)[:50]})
-        
-        # Test Azure AI Projects
-        try:
-            from azure_utils import EnhancedAzureAIAgentClient
-            client = EnhancedAzureAIAgentClient("", "", config, "")  # Pass empty container name
-            agents = client.get_available_agents()
-            status_data.append({"Service": "Azure AI Projects", "Status": "✅ Connected", "Details": f"{len(agents)} agents"})
-        except Exception as e:
-            status_data.append({"Service": "Azure AI Projects", "Status": "❌ Error", "Details": str(e)[:50]})
-        
-        # Display status table
-        df = pd.DataFrame(status_data)
-        st.dataframe(df)
-        
-    except Exception as e:
-        st.error(f"❌ Error checking Azure services: {str(e)}")
-
-def show_azure_ai_agents_list():
-    """Show available Azure AI Project agents"""
-    try:
-        from azure_utils import AzureConfig, EnhancedAzureAIAgentClient
-        config = AzureConfig()
-        
-        # Create a temporary client to get Azure AI agents
-        temp_client = EnhancedAzureAIAgentClient("", "", config, "")  # Pass empty container name
-        azure_agents = temp_client.get_available_agents()
-        
-        if azure_agents:
-            st.success(f"✅ Found {len(azure_agents)} Azure AI agents available")
-            
-            # Display agents in cards
-            cols = st.columns(3)
-            for idx, agent in enumerate(azure_agents):
-                col = cols[idx % 3]
-                
-                with col:
-                    st.markdown(f"""
-                    <div class="agent-card">
-                        <div class="agent-icon">🤖</div>
-                        <div class="agent-title">{agent['name']}</div>
-                        <div class="agent-description">{agent.get('description', 'Azure AI Agent')}</div>
-                        <div class="agent-stats">
-                            <small>
-                                🔧 Model: {agent['model']}<br>
-                                🆔 ID: {agent['id'][:20]}...
-                            </small>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    if st.button(f"Connect to {agent['name']}", key=f"connect_{agent['id']}", type="primary"):
-                        st.session_state.selected_agent = agent['id']  # Use consistent variable name
-                        st.session_state.selected_azure_agent = agent  # Keep backup for compatibility  
-                        st.session_state.current_page = "azure_agent_interface"
-                        st.rerun()
-        else:
-            st.warning("⚠️ No Azure AI agents found. Please check your Azure AI Projects configuration.")
-            st.info("📋 Environment variables needed:")
-            st.code("""
-AZURE_CLIENT_ID=your_client_id
-AZURE_CLIENT_SECRET=your_client_secret  
-AZURE_TENANT_ID=your_tenant_id
-AZURE_SUBSCRIPTION_ID=your_subscription_id
-AZURE_RESOURCE_GROUP_NAME=your_resource_group
-AZURE_AI_PROJECT_NAME=your_project_name
-            """)
-            
-    except Exception as e:
-        st.error(f"❌ Error loading Azure AI agents: {str(e)}")
-        st.info("💡 This might be due to:")
-        st.write("• Missing Azure AI Projects configuration")
-        st.write("• Invalid credentials")
-        st.write("• Network connectivity issues")
-        st.write("• Azure AI Projects service not available")
-
@@ -3,83 +3,30 @@ Azure WebJob ZIP Generator Module
 Generates ready-to-deploy WebJob packages based on user criteria
 """
 
-import os
 import zipfile
 import io
 import json
+import importlib.util
+import marshal
+import struct
+import sys
+import zlib
 from datetime import datetime
-from typing import Dict, List, Optional
-
-
-class WebJobGenerator:
-    """Generator for Azure WebJob packages"""
-    
-    def __init__(self):
-        self.template_dir = os.path.dirname(__file__)
-    
-    def generate_webjob_package(self, config: Dict) -> Optional[bytes]:
-        """
-        Generate a complete WebJob ZIP package based on configuration
-        
-        Args:
-            config: Configuration dictionary with:
-                - agent_id: Agent identifier
-                - agent_name: Human-readable agent name
-                - data_container: Azure Blob container name for data
-                - data_files: List of file names to process
-                - schedule_type: 'manual' or 'scheduled'
-                - schedule_cron: Cron expression if scheduled (e.g., "0 0 9 * * *")
-                - azure_connection_string: Azure Storage connection string
-                - openai_api_key: OpenAI API key for processing
-        
-        Returns:
-            Bytes containing the ZIP file, or None if generation fails
-        """
-        try:
-            # Create in-memory ZIP file
-            zip_buffer = io.BytesIO()
-            
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                # 1. Add run.sh (Linux shell script - entry point for WebJob on Linux)
-                run_sh = self._generate_run_sh()
-                zip_file.writestr('run.sh', run_sh)
-                
-                # 2. Add run.cmd (Windows batch script - entry point for WebJob on Windows)
-                run_cmd = self._generate_run_cmd()
-                zip_file.writestr('run.cmd', run_cmd)
-                
-                # 3. Add main Python script
-                main_script = self._generate_main_script(config)
-                zip_file.writestr('run.py', main_script)
-                
-                # 4. Add requirements.txt
-                requirements = self._generate_requirements()
-                zip_file.writestr('requirements.txt', requirements)
-                
-                # 5. Add settings.job (for scheduled jobs)
-                if config.get('schedule_type') == 'scheduled':
-                    settings_job = self._generate_settings_job(config)
-                    zip_file.writestr('settings.job', settings_job)
-                
-                # 6. Add configuration file
-                config_file = self._generate_config_file(config)
-                zip_file.writestr('config.json', config_file)
-                
-                # 7. Add README
-                readme = self._generate_readme(config)
-                zip_file.writestr('README.md', readme)
-            
-            zip_buffer.seek(0)
-            return zip_buffer.getvalue()
-            
-        except Exception as e:
-            print(f"Error generating WebJob package: {e}")
-            return None
-    
-    def _generate_run_sh(self) -> str:
-        """Generate the run.sh shell script (entry point for WebJob on Linux)"""
-        
-        script = '''#!/bin/bash
+from functools import lru_cache
+from typing import BinaryIO, Dict, Iterator, List, Tuple
+
+# Compact JSON straight to bytes; orjson is optional. The fallback writes raw UTF-8
+# too, so packages are identical with or without orjson.
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+# Static package files, encoded once at import so writestr gets bytes directly
+# Entry point for WebJobs on Linux
+_RUN_SH = '''#!/bin/bash
 echo "========================================"
 echo "Azure WebJob - Data Processing"
 echo "========================================"
@@ -96,7 +43,7 @@ echo "✓ Dependencies installed"
 
 echo ""
 echo "[2/3] Running main script..."
-python3 run.py
+python3 -m run
 if [ $? -ne 0 ]; then
     echo "ERROR: Script execution failed"
     exit 1
@@ -106,13 +53,10 @@ echo ""
 echo "[3/3] WebJob completed successfully!"
 echo "========================================"
 exit 0
-'''
-        return script
-    
-    def _generate_run_cmd(self) -> str:
-        """Generate the run.cmd batch script (entry point for WebJob)"""
-        
-        script = '''@echo off
+'''.encode('utf-8')
+
+# Entry point for WebJobs on Windows
+_RUN_CMD = '''@echo off
 echo ========================================
 echo Azure WebJob - Data Processing
 echo ========================================
@@ -129,7 +73,7 @@ echo ✓ Dependencies installed
 
 echo.
 echo [2/3] Running main script...
-python run.py
+python -m run
 if %ERRORLEVEL% NEQ 0 (
     echo ERROR: Script execution failed
     exit /b 1
@@ -139,29 +83,125 @@ echo.
 echo [3/3] WebJob completed successfully!
 echo ========================================
 exit /b 0
-'''
-        return script
+'''.encode('utf-8')
+
+# Dependencies installed by run.sh/run.cmd before run.py starts
+_REQUIREMENTS_TXT = '''# Azure WebJob Requirements
+# Core Azure SDKs (same versions as reference v0927-prod-egent2)
+azure-storage-blob==12.27.0
+azure-identity==1.25.1
+azure-ai-projects==1.0.0b10
+
+# Utilities
+python-dateutil>=2.8.2
+requests>=2.31.0
+
+# Data Processing
+pandas>=2.0.0
+openpyxl>=3.1.0
+
+# AI Integration
+openai>=1.12.0
+'''.encode('utf-8')
+
+# Fixed entry timestamp (the ZIP epoch): no time.localtime() per entry, and identical
+# files produce identical archive bytes
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def _zip_entry(name: str, compress_type: int) -> zipfile.ZipInfo:
+    """ZipInfo for one package entry; a fresh one per write since writestr fills it in"""
+    info = zipfile.ZipInfo(name, date_time=_ZIP_DATE_TIME)
+    info.compress_type = compress_type
+    info.external_attr = 0o600 << 16  # Same permissions writestr gives a plain name
+    return info
+
+
+# Record layouts for the plain STORED archive written by _write_stored_zip: local file
+# header, central directory header and end of central directory
+_LOCAL_HEADER = struct.Struct('<IHHHHHIIIHH')
+_CENTRAL_HEADER = struct.Struct('<IHHHHHHIIIHHHHHII')
+_END_RECORD = struct.Struct('<IHHHHIIH')
+_ZIP_VERSION = 20  # 2.0, what zipfile writes for STORED entries
+_ZIP_CREATE_VERSION = (3 << 8) | _ZIP_VERSION  # Made on Unix, so external_attr holds the mode
+_ZIP_DOS_DATE = ((_ZIP_DATE_TIME[0] - 1980) << 9) | (_ZIP_DATE_TIME[1] << 5) | _ZIP_DATE_TIME[2]
+_ZIP_DOS_TIME = (_ZIP_DATE_TIME[3] << 11) | (_ZIP_DATE_TIME[4] << 5) | (_ZIP_DATE_TIME[5] // 2)
+
+# CRC32 of the static entries, computed once at import and keyed by archive name;
+# _package_entries always stores these constants under these names
+_STATIC_CRCS = {
+    'run.sh': zlib.crc32(_RUN_SH),
+    'run.cmd': zlib.crc32(_RUN_CMD),
+    'requirements.txt': zlib.crc32(_REQUIREMENTS_TXT),
+}
+
+
+def _iter_stored_zip(entries: List[Tuple[str, bytes]]) -> Iterator[bytes]:
+    """
+    Yield an uncompressed ZIP archive of (archive name, bytes) pairs in chunks
     
-    def _generate_main_script(self, config: Dict) -> str:
-        """Generate the main Python script for the WebJob"""
-        
-        agent_id = config.get('agent_id', 'unknown_agent')
-        agent_name = config.get('agent_name', 'Unknown Agent')
-        data_container = config.get('data_container', '')
-        data_files = config.get('data_files', [])
-        
-        script = f'''#!/usr/bin/env python3
+    Each entry's local header and its data come out as soon as they are
+    packed, followed by the central directory and end record in one chunk.
+    Byte-for-byte what zipfile.ZipFile writes for the same entries with
+    _zip_entry(name, ZIP_STORED), without its per-entry Python machinery.
+    No ZIP64 support: the package is a handful of small text files.
+    """
+    central = []
+    offset = 0
+    for name, data in entries:
+        try:
+            name_bytes = name.encode('ascii')
+            flags = 0
+        except UnicodeEncodeError:
+            name_bytes = name.encode('utf-8')
+            flags = 0x800  # Name is UTF-8
+        crc = _STATIC_CRCS.get(name)
+        if crc is None:
+            crc = zlib.crc32(data)
+        size = len(data)
+        central.append(_CENTRAL_HEADER.pack(
+            0x02014b50, _ZIP_CREATE_VERSION, _ZIP_VERSION, flags, zipfile.ZIP_STORED,
+            _ZIP_DOS_TIME, _ZIP_DOS_DATE, crc, size, size, len(name_bytes), 0, 0, 0, 0,
+            0o600 << 16, offset
+        ))
+        central.append(name_bytes)
+        yield _LOCAL_HEADER.pack(
+            0x04034b50, _ZIP_VERSION, flags, zipfile.ZIP_STORED,
+            _ZIP_DOS_TIME, _ZIP_DOS_DATE, crc, size, size, len(name_bytes), 0
+        ) + name_bytes
+        yield data  # Passed through as-is, never copied
+        offset += _LOCAL_HEADER.size + len(name_bytes) + size
+    
+    central_size = sum(map(len, central))
+    central.append(_END_RECORD.pack(
+        0x06054b50, 0, 0, len(entries), len(entries), central_size, offset, 0
+    ))
+    yield b''.join(central)
+
+
+def _write_stored_zip(entries: List[Tuple[str, bytes]]) -> bytes:
+    """Build an uncompressed ZIP archive from (archive name, bytes) pairs"""
+    # One join allocates the archive at its exact size with no regrowth or final copy
+    return b''.join(_iter_stored_zip(entries))
+
+
+# run.py and README.md templates, filled with str.format_map; literal braces are doubled.
+# Values placed in run.py are escaped with _py_str so any name still compiles.
+# The timestamped parts are kept apart so the large bodies can be memoized.
+_MAIN_SCRIPT_HEADER_TMPL = '''#!/usr/bin/env python3
 """
 Azure WebJob for {agent_name}
-Auto-generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Auto-generated on {generated_at}
 """
+'''
 
+_MAIN_SCRIPT_TMPL = '''
 import os
 import sys
 import json
 import logging
-import tempfile
 import io
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from azure.storage.blob import BlobServiceClient
 from azure.ai.projects import AIProjectClient
@@ -175,10 +215,11 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Configuration
-AGENT_ID = "{agent_id}"
-AGENT_NAME = "{agent_name}"
-DATA_CONTAINER = "{data_container}"
-DATA_FILES = {json.dumps(data_files)}
+AGENT_ID = {agent_id}
+AGENT_NAME = {agent_name}
+DATA_CONTAINER = {data_container}
+DATA_FILES = {data_files_json}
+MAX_PARALLEL_TRANSFERS = 4  # Files downloaded/uploaded at the same time
 
 def load_config():
     """Load configuration from config.json or environment"""
@@ -218,16 +259,14 @@ def get_agent_id():
         logger.error("This should be automatically included from agent configuration")
     return agent_id
 
-def upload_file_to_agent(ai_client, agent_id, file_path, filename):
-    """Upload a file to Azure AI Agent's Code Interpreter"""
+def upload_file_to_agent(ai_client, agent_id, file_data, filename):
+    """Upload file contents to Azure AI Agent's Code Interpreter"""
+    file_size = len(file_data)
     try:
-        # Get file size for logging
-        file_size = os.path.getsize(file_path)
         logger.info(f"Uploading {{filename}} ({{file_size:,}} bytes) to AI Agent storage...")
         
-        # Read file and create file stream
-        with open(file_path, 'rb') as f:
-            file_stream = io.BytesIO(f.read())
+        # A BytesIO over the downloaded bytes shares them, so nothing is copied
+        file_stream = io.BytesIO(file_data)
         file_stream.name = filename
         
         # Upload using upload_file (correct method for AIProjectClient)
@@ -391,6 +430,25 @@ def attach_file_to_agent(ai_client, agent_id, file_id, clear_existing=False):
         logger.error(f"Failed to attach file to agent: {{e}}")
         return False
 
+def fetch_and_upload_file(container_client, ai_client, agent_id, filename):
+    """
+    Download one data file from blob storage and upload it to the agent's file storage
+    
+    Runs on a worker thread. Returns the uploaded file ID, or None if the upload failed;
+    raises FileNotFoundError if the blob does not exist.
+    """
+    blob_client = container_client.get_blob_client(filename)
+    
+    if not blob_client.exists():
+        raise FileNotFoundError(filename)
+    
+    # Download blob data
+    blob_data = blob_client.download_blob().readall()
+    logger.info(f"  ↓ Downloaded {{len(blob_data):,}} bytes from blob storage: {{filename}}")
+    
+    # Upload to AI Agent's Code Interpreter straight from memory
+    return upload_file_to_agent(ai_client, agent_id, blob_data, filename)
+
 def process_data_files():
     """Main processing function for data files"""
     logger.info(f"Starting WebJob for {{AGENT_NAME}} ({{AGENT_ID}})")
@@ -491,58 +549,45 @@ def process_data_files():
         error_count = 0
         uploaded_file_ids = []
         
-        for idx, filename in enumerate(DATA_FILES, 1):
-            try:
-                logger.info(f"[{{idx}}/{{len(DATA_FILES)}}] Processing: {{filename}}")
-                
-                # Download file from blob
-                blob_client = container_client.get_blob_client(filename)
-                
-                if not blob_client.exists():
-                    logger.warning(f"⚠️  File not found in blob storage: {{filename}}")
-                    error_count += 1
-                    continue
-                
-                # Download blob data
-                blob_data = blob_client.download_blob().readall()
-                logger.info(f"  ↓ Downloaded {{len(blob_data):,}} bytes from blob storage")
-                
-                # Save to temporary file
-                with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(filename)[1]) as temp_file:
-                    temp_file.write(blob_data)
-                    temp_file_path = temp_file.name
-                
-                # Upload to AI Agent's Code Interpreter (use actual_agent_id from config)
-                file_id = upload_file_to_agent(ai_client, actual_agent_id, temp_file_path, filename)
-                
-                # Clean up temp file
+        # Downloads and uploads run in parallel; attaching stays sequential, in
+        # DATA_FILES order, since each attach rewrites the agent's file list
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_TRANSFERS) as executor:
+            uploads = [
+                executor.submit(fetch_and_upload_file, container_client, ai_client, actual_agent_id, filename)
+                for filename in DATA_FILES
+            ]
+            
+            for idx, (filename, upload) in enumerate(zip(DATA_FILES, uploads), 1):
                 try:
-                    os.unlink(temp_file_path)
-                except:
-                    pass
-                
-                if file_id:
-                    # Attach file to agent (clear code interpreter files only on first upload)
-                    clear_existing = (len(uploaded_file_ids) == 0)
-                    attach_success = attach_file_to_agent(ai_client, actual_agent_id, file_id, clear_existing)
+                    logger.info(f"[{{idx}}/{{len(DATA_FILES)}}] Processing: {{filename}}")
+                    
+                    file_id = upload.result()
                     
-                    if attach_success:
-                        uploaded_file_ids.append({{'filename': filename, 'file_id': file_id}})
-                        processed_count += 1
-                        logger.info(f"  ✅ Successfully uploaded and attached to Code Interpreter")
+                    if file_id:
+                        # Attach file to agent (clear code interpreter files only on first upload)
+                        clear_existing = (len(uploaded_file_ids) == 0)
+                        attach_success = attach_file_to_agent(ai_client, actual_agent_id, file_id, clear_existing)
+                        
+                        if attach_success:
+                            uploaded_file_ids.append({{'filename': filename, 'file_id': file_id}})
+                            processed_count += 1
+                            logger.info(f"  ✅ Successfully uploaded and attached to Code Interpreter")
+                        else:
+                            error_count += 1
+                            logger.error(f"  ❌ File uploaded but failed to attach to agent")
                     else:
                         error_count += 1
-                        logger.error(f"  ❌ File uploaded but failed to attach to agent")
-                else:
+                        logger.error(f"  ❌ Failed to upload to Code Interpreter")
+                    
+                    logger.info("")
+                    
+                except FileNotFoundError:
+                    logger.warning(f"⚠️  File not found in blob storage: {{filename}}")
                     error_count += 1
-                    logger.error(f"  ❌ Failed to upload to Code Interpreter")
-                
-                logger.info("")
-                
-            except Exception as file_error:
-                logger.error(f"  ❌ Error processing {{filename}}: {{file_error}}")
-                error_count += 1
-                logger.info("")
+                except Exception as file_error:
+                    logger.error(f"  ❌ Error processing {{filename}}: {{file_error}}")
+                    error_count += 1
+                    logger.info("")
         
         # Summary
         logger.info("=" * 60)
@@ -595,74 +640,14 @@ def process_data_files():
 if __name__ == "__main__":
     process_data_files()
 '''
-        
-        return script
-    
-    def _generate_requirements(self) -> str:
-        """Generate requirements.txt for the WebJob"""
-        
-        requirements = '''# Azure WebJob Requirements
-# Core Azure SDKs (same versions as reference v0927-prod-egent2)
-azure-storage-blob==12.27.0
-azure-identity==1.25.1
-azure-ai-projects==1.0.0b10
-
-# Utilities
-python-dateutil>=2.8.2
-requests>=2.31.0
-
-# Data Processing
-pandas>=2.0.0
-openpyxl>=3.1.0
 
-# AI Integration
-openai>=1.12.0
-'''
-        
-        return requirements
-    
-    def _generate_settings_job(self, config: Dict) -> str:
-        """Generate settings.job for scheduled WebJobs"""
-        
-        schedule_cron = config.get('schedule_cron', '0 0 9 * * *')  # Default: 9 AM daily
-        
-        settings = f'''{{
-    "schedule": "{schedule_cron}"
-}}
-'''
-        
-        return settings
-    
-    def _generate_config_file(self, config: Dict) -> str:
-        """Generate config.json with sanitized configuration"""
-        
-        safe_config = {
-            'agent_id': config.get('agent_id'),
-            'agent_name': config.get('agent_name'),
-            'azure_ai_project_connection_string': config.get('azure_ai_project_connection_string'),
-            'azure_ai_agent_id': config.get('azure_ai_agent_id'),
-            'data_container': config.get('data_container'),
-            'data_files': config.get('data_files', []),
-            'schedule_type': config.get('schedule_type'),
-            'generated_at': datetime.now().isoformat()
-        }
-        
-        return json.dumps(safe_config, indent=2)
-    
-    def _generate_readme(self, config: Dict) -> str:
-        """Generate README.md with deployment instructions"""
-        
-        agent_name = config.get('agent_name', 'Agent')
-        schedule_type = config.get('schedule_type', 'manual')
-        schedule_cron = config.get('schedule_cron', 'N/A')
-        
-        readme = f'''# Azure WebJob for {agent_name}
+_README_TMPL = '''# Azure WebJob for {agent_name}
 
 ## Overview
 This WebJob package was automatically generated for the {agent_name} agent.
 
 **Schedule Type:** {schedule_type}
-**Schedule (Cron):** {schedule_cron if schedule_type == 'scheduled' else 'N/A - Run manually'}
+**Schedule (Cron):** {schedule_cron}
 
 ## Deployment Instructions
 
@@ -678,9 +663,9 @@ This WebJob package was automatically generated for the {agent_name} agent.
 2. Go to **WebJobs** section
 3. Click **Add**
 4. Fill in the details:
-   - **Name:** {config.get('agent_id', 'webjob')}
+   - **Name:** {webjob_name}
    - **File Upload:** Upload this ZIP file
-   - **Type:** {"Continuous" if schedule_type == 'scheduled' else "Triggered"}
+   - **Type:** {webjob_type}
    - **Scale:** Single Instance
 5. Click **OK**
 
@@ -692,7 +677,7 @@ az login
 # Set variables
 RESOURCE_GROUP="your-resource-group"
 WEBAPP_NAME="your-webapp-name"
-WEBJOB_NAME="{config.get('agent_id', 'webjob')}"
+WEBJOB_NAME="{webjob_name}"
 
 # Deploy WebJob
 az webapp webjob triggered upload \\
@@ -755,29 +740,277 @@ The main processing logic is in `run.py`. You can modify:
 - Ensure data files exist in the specified container
 - Check Python runtime version compatibility
 
-## Generated Information
-- **Generated At:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-- **Agent ID:** {config.get('agent_id')}
-- **Data Container:** {config.get('data_container')}
-- **Data Files:** {', '.join(config.get('data_files', []))}
+'''
+
+_README_FOOTER_TMPL = '''## Generated Information
+- **Generated At:** {generated_at}
+- **Agent ID:** {agent_id}
+- **Data Container:** {data_container}
+- **Data Files:** {data_files_csv}
 
 ---
 *This WebJob package was automatically generated by the EGEnts AI Platform*
 '''
-        
-        return readme
 
 
-# Convenience function for direct use
-def create_webjob_package(config: Dict) -> Optional[bytes]:
+def _py_str(value: str) -> str:
+    """Quoted Python string literal for value (a JSON string is also a valid Python one)"""
+    return json.dumps(value, ensure_ascii=False)
+
+
+@lru_cache(maxsize=256)
+def _main_script_body(agent_id: str, agent_name: str, data_container: str, data_files_json: str) -> bytes:
+    """run.py below its timestamped docstring"""
+    return _MAIN_SCRIPT_TMPL.format_map({
+        'agent_id': _py_str(agent_id),
+        'agent_name': _py_str(agent_name),
+        'data_container': _py_str(data_container),
+        'data_files_json': data_files_json
+    }).encode('utf-8')
+
+
+def _generate_main_script(config: Dict, data_files_json: str, generated_at: str) -> bytes:
+    """Generate the main Python script for the WebJob"""
+    
+    agent_id = config.get('agent_id', 'unknown_agent')
+    agent_name = config.get('agent_name', 'Unknown Agent')
+    data_container = config.get('data_container', '')
+    
+    header = _MAIN_SCRIPT_HEADER_TMPL.format_map({
+        'agent_name': _py_str(agent_name)[1:-1],  # Escaped, so quotes cannot end the docstring
+        'generated_at': generated_at
+    }).encode('utf-8')
+    return header + _main_script_body(agent_id, agent_name, data_container, data_files_json)
+
+
+def _compile_main_script(source: bytes) -> Tuple[str, bytes]:
+    """
+    Precompile run.py into a checked hash-based .pyc (PEP 552)
+    
+    run.sh/run.cmd start it with -m, so the interpreter picks the .pyc up from
+    __pycache__ and skips compiling run.py at cold start. The file is tagged with
+    the generator's cache tag (e.g. cpython-311), so a WebJob host on any other
+    Python version ignores it and compiles run.py as before. It is re-validated
+    against the source hash, so an edited run.py is recompiled rather than
+    shadowed. Compiling here also rejects a broken script before it is packaged.
     """
-    Create a WebJob package with the given configuration
+    code = compile(source, 'run.py', 'exec', dont_inherit=True)
+    pyc = bytearray(importlib.util.MAGIC_NUMBER)
+    pyc += (0b11).to_bytes(4, 'little')  # Hash-based, check source
+    pyc += importlib.util.source_hash(source)
+    pyc += marshal.dumps(code)
+    return f'__pycache__/run.{sys.implementation.cache_tag}.pyc', bytes(pyc)
+
+
+@lru_cache(maxsize=64)
+def _settings_job(schedule_cron: str) -> bytes:
+    """settings.job body for one cron expression"""
+    # json.dumps also escapes quotes in the cron expression
+    return _dumps({"schedule": schedule_cron})
+
+
+def _generate_settings_job(config: Dict) -> bytes:
+    """Generate settings.job for scheduled WebJobs"""
+    
+    schedule_cron = config.get('schedule_cron', '0 0 9 * * *')  # Default: 9 AM daily
+    
+    return _settings_job(schedule_cron)
+
+
+def _generate_config_file(config: Dict, data_files: List[str], generated_at: str) -> bytes:
+    """Generate config.json with sanitized configuration"""
+    
+    safe_config = {
+        'agent_id': config.get('agent_id'),
+        'agent_name': config.get('agent_name'),
+        'azure_ai_project_connection_string': config.get('azure_ai_project_connection_string'),
+        'azure_ai_agent_id': config.get('azure_ai_agent_id'),
+        'data_container': config.get('data_container'),
+        'data_files': data_files,
+        'schedule_type': config.get('schedule_type'),
+        'generated_at': generated_at
+    }
+    
+    # Read by run.py, not by people, so no indentation
+    return _dumps(safe_config)
+
+
+@lru_cache(maxsize=256)
+def _readme_body(agent_name: str, schedule_type: str, schedule_cron: str, webjob_name: str) -> bytes:
+    """README.md up to its timestamped Generated Information section"""
+    return _README_TMPL.format_map({
+        'agent_name': agent_name,
+        'schedule_type': schedule_type,
+        'schedule_cron': schedule_cron if schedule_type == 'scheduled' else 'N/A - Run manually',
+        'webjob_name': webjob_name,
+        'webjob_type': "Continuous" if schedule_type == 'scheduled' else "Triggered"
+    }).encode('utf-8')
+
+
+def _generate_readme(config: Dict, data_files_csv: str, generated_at: str) -> bytes:
+    """Generate README.md with deployment instructions"""
+    
+    agent_name = config.get('agent_name', 'Agent')
+    schedule_type = config.get('schedule_type', 'manual')
+    schedule_cron = config.get('schedule_cron', 'N/A')
+    
+    footer = _README_FOOTER_TMPL.format_map({
+        'generated_at': generated_at,
+        'agent_id': config.get('agent_id'),
+        'data_container': config.get('data_container'),
+        'data_files_csv': data_files_csv
+    }).encode('utf-8')
+    return _readme_body(agent_name, schedule_type, schedule_cron, config.get('agent_id', 'webjob')) + footer
+
+
+def _package_entries(config: Dict) -> List[Tuple[str, bytes]]:
+    """Generate every package file as (archive name, bytes), in archive order"""
+    # Shared by several entries: serialize the file list and read the clock once
+    data_files = config.get('data_files', [])
+    data_files_json = _dumps(data_files).decode('utf-8')  # Also a valid Python list literal
+    data_files_csv = ', '.join(data_files)
+    now = datetime.now()
+    now_iso = now.isoformat()
+    now_pretty = now.strftime('%Y-%m-%d %H:%M:%S')
+    
+    main_script = _generate_main_script(config, data_files_json, now_pretty)
+    
+    entries = [
+        # 1. run.sh (Linux shell script - entry point for WebJob on Linux)
+        ('run.sh', _RUN_SH),
+        # 2. run.cmd (Windows batch script - entry point for WebJob on Windows)
+        ('run.cmd', _RUN_CMD),
+        # 3. Main Python script, plus its precompiled bytecode
+        ('run.py', main_script),
+        _compile_main_script(main_script),
+        # 4. requirements.txt
+        ('requirements.txt', _REQUIREMENTS_TXT),
+    ]
+    
+    # 5. settings.job (for scheduled jobs)
+    if config.get('schedule_type') == 'scheduled':
+        entries.append(('settings.job', _generate_settings_job(config)))
+    
+    # 6. Configuration file
+    entries.append(('config.json', _generate_config_file(config, data_files, now_iso)))
+    
+    # 7. README
+    entries.append(('README.md', _generate_readme(config, data_files_csv, now_pretty)))
+    return entries
+
+
+def _write_zip(config: Dict, sink: BinaryIO, compress: bool) -> None:
+    """Write all package entries as a ZIP archive into sink"""
+    entries = _package_entries(config)
+    
+    if not compress:
+        sink.write(_write_stored_zip(entries))
+        return
+    
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        for name, data in entries:
+            # Level 1: the entries are small text files, so higher levels buy almost nothing.
+            # Passed per entry because writestr ignores the archive level for a ZipInfo.
+            zip_file.writestr(_zip_entry(name, zipfile.ZIP_DEFLATED), data, compresslevel=1)
+
+
+def _build_package(config: Dict, compress: bool) -> bytes:
+    """The complete ZIP archive as a single bytes object"""
+    if not compress:
+        return _write_stored_zip(_package_entries(config))
+    
+    zip_buffer = io.BytesIO()
+    _write_zip(config, zip_buffer, compress)
+    # getvalue() hands over the buffer's own bytes object instead of copying it
+    return zip_buffer.getvalue()
+
+
+# Convenience functions for direct use
+def create_webjob_package(config: Dict, compress: bool = False) -> bytes:
+    """
+    Create a complete WebJob ZIP package based on configuration
     
     Args:
-        config: Configuration dictionary
-        
+        config: Configuration dictionary with:
+            - agent_id: Agent identifier
+            - agent_name: Human-readable agent name
+            - data_container: Azure Blob container name for data
+            - data_files: List of file names to process
+            - schedule_type: 'manual' or 'scheduled'
+            - schedule_cron: Cron expression if scheduled (e.g., "0 0 9 * * *")
+            - azure_connection_string: Azure Storage connection string
+            - openai_api_key: OpenAI API key for processing
+        compress: Deflate the entries (at level 1); off by default since the few KB of
+            text barely shrink
+    
     Returns:
-        ZIP file bytes or None
+        Bytes containing the ZIP file, stamped with the time of this call. The
+        timestamp-free run.py, README and settings.job bodies are memoized, so a
+        repeated configuration only re-renders the stamped parts.
+    
+    Raises:
+        Any error from building the package; callers report it
+    """
+    return _build_package(config, compress)
+
+
+def create_webjob_package_stream(config: Dict, compress: bool = False) -> io.BytesIO:
     """
-    generator = WebJobGenerator()
-    return generator.generate_webjob_package(config)
+    Create the WebJob ZIP package in a rewound in-memory stream
+    
+    Same arguments as create_webjob_package; for callers that stream the
+    package (HTTP responses, blob uploads) instead of holding a bytes copy.
+    """
+    # A BytesIO seeded with bytes shares them until written to, so this is no copy
+    return io.BytesIO(_build_package(config, compress))
+
+
+def write_webjob_package(config: Dict, sink: BinaryIO, compress: bool = False) -> None:
+    """
+    Write a WebJob package with the given configuration into a binary stream
+    
+    Args:
+        config: Configuration dictionary
+        sink: Writable binary stream; it does not need to be seekable, so it can be
+            an HTTP response body or a blob upload stream
+        compress: Deflate the ZIP entries instead of storing them
+    """
+    _write_zip(config, sink, compress)
+
+
+def iter_webjob_package(config: Dict) -> Iterator[bytes]:
+    """
+    Generate an uncompressed WebJob package as a sequence of bytes chunks
+    
+    Yields each entry's header and contents in turn, then the central
+    directory, so an HTTP response or blob upload can start sending without
+    the whole archive ever being assembled in one buffer. Concatenated, the
+    chunks are the same archive create_webjob_package returns.
+    
+    Args:
+        config: Configuration dictionary, as for create_webjob_package
+    """
+    return _iter_stored_zip(_package_entries(config))
+
+
+class WebJobGenerator:
+    """Backward-compatible wrapper around the module-level package functions"""
+    
+    # Stateless: everything comes from the config passed to each call
+    __slots__ = ()
+    
+    def generate_webjob_package(self, config: Dict, compress: bool = False) -> bytes:
+        """See create_webjob_package"""
+        return create_webjob_package(config, compress)
+    
+    def generate_webjob_package_stream(self, config: Dict, compress: bool = False) -> io.BytesIO:
+        """See create_webjob_package_stream"""
+        return create_webjob_package_stream(config, compress)
+    
+    def write_webjob_package(self, config: Dict, sink: BinaryIO, compress: bool = False) -> None:
+        """See write_webjob_package"""
+        write_webjob_package(config, sink, compress)
+    
+    def iter_webjob_package(self, config: Dict) -> Iterator[bytes]:
+        """See iter_webjob_package"""
+        return iter_webjob_package(config)